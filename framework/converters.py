@@ -0,0 +1,28 @@
+from __future__ import annotations
+
+from starlette.convertors import Convertor, register_url_convertor
+
+# For query params, where route converters don't apply; validated by FastAPI's
+# compiled regex instead of Pydantic UUID construction.
+UUID_PATTERN = r"^[0-9a-fA-F-]{36}$"
+
+
+class UuidStrConvertor(Convertor):
+    """
+    Match UUID-shaped path segments at the router level with one compiled
+    regex, keeping the value a plain str (repositories take strings anyway).
+    Malformed IDs 404 before any dependency or handler code runs.
+    """
+
+    regex = "[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}"
+
+    def convert(self, value: str) -> str:
+        return value
+
+    def to_string(self, value: str) -> str:
+        return value
+
+
+def register_converters() -> None:
+    """Idempotent registration; call before any routes are declared."""
+    register_url_convertor("uuid_str", UuidStrConvertor())
@@ -0,0 +1,50 @@
+from __future__ import annotations
+
+import msgspec
+import orjson
+from fastapi.responses import Response
+
+_STRUCT_ENCODER = msgspec.json.Encoder()
+
+# Repository timestamps are naive UTC; these flags make orjson emit them as
+# explicit "...Z" instants, in the same C fast path.
+_ORJSON_OPTS = orjson.OPT_NAIVE_UTC | orjson.OPT_UTC_Z
+
+
+def model_response(model, status_code: int = 200, headers: dict | None = None) -> Response:
+    """
+    Serialize a repository-produced model straight through orjson. Returning a
+    Response skips FastAPI's outbound response_model re-validation; the decorators
+    keep response_model= purely for the OpenAPI docs.
+    """
+    # warnings=False: repositories built with model_construct keep ids as str,
+    # which serializes identically but would trip the UUID-mismatch warning.
+    return Response(
+        content=orjson.dumps(model.model_dump(warnings=False), option=_ORJSON_OPTS),
+        status_code=status_code,
+        media_type="application/json",
+        headers=headers,
+    )
+
+
+def struct_response(value, status_code: int = 200, headers: dict | None = None) -> Response:
+    """
+    Encode a msgspec Struct (or list of them) directly to JSON bytes — no
+    intermediate dict per object, unlike model_dump + orjson.
+    """
+    return Response(
+        content=_STRUCT_ENCODER.encode(value),
+        status_code=status_code,
+        media_type="application/json",
+        headers=headers,
+    )
+
+
+def weak_etag(resource_id, updated_at) -> str:
+    """Weak validator derived from identity + last-write time (µs precision)."""
+    return f'W/"{resource_id}-{int(updated_at.timestamp() * 1e6)}"'
+
+
+def not_modified(etag: str) -> Response:
+    """304 with the validator echoed, per RFC 9110 — no body serialization."""
+    return Response(status_code=304, headers={"ETag": etag})
@@ -1,129 +1,40 @@
 from __future__ import annotations
 
 import os
-import socket
-from datetime import datetime
-from typing import Optional
-from uuid import UUID
-from urllib.parse import urlencode
+from contextlib import asynccontextmanager
 
-import requests
 from dotenv import load_dotenv
 
 load_dotenv()
 
-from fastapi import Body, Depends, FastAPI, HTTPException, Query, Request, status
-from fastapi.responses import JSONResponse, RedirectResponse, Response
+from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse
 from fastapi.middleware.cors import CORSMiddleware
-from google.auth.transport import requests as google_requests
-from google.oauth2 import id_token as google_id_token
-from sqlalchemy import create_engine, text
-
-# Your model imports
-from models.health import Health
-from models.photos import PhotoCreate, PhotoRead, PhotoUpdate
-from models.profile import ProfileCreate, ProfileRead, ProfileUpdate
-from models.user import LoginRequest, SignupRequest, TokenResponse, UserPublic
-from models.visibility import VisibilityCreate, VisibilityRead, VisibilityUpdate
-from services.profile_repository import ProfileRepository
-from services.photo_repository import PhotoRepository
-from services.user_repository import UserRepository
-from utils.auth import TokenPayload, create_access_token, get_current_user
+from fastapi.middleware.gzip import GZipMiddleware
+from starlette.concurrency import run_in_threadpool
+
+from framework.converters import register_converters
+from middleware.request_clock import RequestClockMiddleware
+from middleware.response_cache import ResponseCacheMiddleware
+from services.database import async_engine, engine, ping_database
+
+# Routes using the uuid_str converter are compiled at import, so registration
+# has to precede the resource imports.
+register_converters()
+
+from resources import auth, health, photos, profiles, visibility  # noqa: E402
+from services import repositories  # noqa: E402
+from services.photo_repository import PhotoRepository  # noqa: E402
+from services.profile_repository import ProfileRepository  # noqa: E402
+from services.user_repository import UserRepository  # noqa: E402
+from models.photos import PhotoCreate, PhotoRead, PhotoUpdate  # noqa: E402
+from models.profile import ProfileCreate, ProfileRead, ProfileUpdate  # noqa: E402
 
 port = int(os.environ.get("FASTAPIPORT", 8000))
 
-# -----------------------------------------------------------
-# 🚀 DB CONNECTION (Cloud SQL with local fallback)
-# -----------------------------------------------------------
-
-required_env = ["DB_USER", "DB_PASS", "DB_NAME"]
-missing_env = [key for key in required_env if not os.environ.get(key)]
-
-engine = None
-
-if missing_env:
-    print(
-        f"⚠️  Missing DB env vars {missing_env}. "
-        "Skipping database connection; API will start but DB-backed endpoints will fail."
-    )
-else:
-    prefer_local = os.environ.get("USE_LOCAL_DB", "").lower() in ("1", "true", "yes")
-    instance_conn_name = os.environ.get("INSTANCE_CONNECTION_NAME")
-    local_host = os.environ.get("LOCAL_DB_HOST", "127.0.0.1")
-    local_port = int(os.environ.get("LOCAL_DB_PORT", "3306"))
-
-    if prefer_local or not instance_conn_name:
-        # Direct TCP connection to local MySQL (Docker)
-        print(f"Using local MySQL at {local_host}:{local_port}")
-        url = (
-            f"mysql+pymysql://{os.environ['DB_USER']}:{os.environ['DB_PASS']}"
-            f"@{local_host}:{local_port}/{os.environ['DB_NAME']}"
-        )
-        try:
-            engine = create_engine(url, pool_pre_ping=True)
-            with engine.connect() as conn:
-                conn.execute(text("SELECT 1"))
-                print("✔ Database connection established to local MySQL!")
-        except Exception as exc:
-            print(
-                f"⚠️  Local DB connection failed ({exc}). "
-                "Continuing startup without a DB connection; DB-backed endpoints will fail."
-            )
-            engine = None
-    else:
-        # Cloud SQL via connector
-        from google.cloud.sql.connector import Connector  # type: ignore
-        import pymysql  # noqa: F401
-
-        INSTANCE_CONNECTION_NAME = instance_conn_name
-
-        def getconn():
-            connector = Connector()  # creates secure Cloud SQL tunnel
-            conn = connector.connect(
-                INSTANCE_CONNECTION_NAME,
-                "pymysql",
-                user=os.environ["DB_USER"],
-                password=os.environ["DB_PASS"],
-                db=os.environ["DB_NAME"],
-            )
-            return conn
-
-        try:
-            engine = create_engine(
-                "mysql+pymysql://",
-                creator=getconn,
-                pool_pre_ping=True,
-            )
-
-            print("Using Cloud SQL Connector. Testing connection...")
-
-            with engine.connect() as conn:
-                conn.execute(text("SELECT 1"))
-                print("✔ Database connection established via Cloud SQL Connector!")
-        except Exception as exc:
-            print(
-                f"⚠️  Cloud SQL connection failed ({exc}). "
-                "Continuing startup without a DB connection; DB-backed endpoints will fail."
-            )
-            engine = None
-
-user_repository = UserRepository(engine)
-profile_repository = ProfileRepository(engine)
-photo_repository = PhotoRepository(engine)
-
-GOOGLE_AUTH_BASE = "https://accounts.google.com/o/oauth2/v2/auth"
-GOOGLE_TOKEN_ENDPOINT = "https://oauth2.googleapis.com/token"
-COOKIE_SECURE = os.environ.get("COOKIE_SECURE", "").lower() in ("1", "true", "yes")
-COOKIE_SAMESITE = "none" if COOKIE_SECURE else "lax"
-FRONTEND_ORIGIN = os.environ.get(
-    "FRONTEND_ORIGIN", "https://nice2meetu-webapp.storage.googleapis.com"
-).rstrip("/")
-FRONTEND_CALLBACK_PATH = os.environ.get("FRONTEND_CALLBACK_PATH", "/auth/google/callback")
-FRONTEND_PROFILE_PATH = os.environ.get("FRONTEND_PROFILE_PATH", "/profile/index.html")
-FRONTEND_ONBOARDING_PATH = os.environ.get("DEFAULT_REDIRECT_PATH") or os.environ.get(
-    "FRONTEND_ONBOARDING_PATH", "/onboarding"
-)
-DEFAULT_REDIRECT_PATH = os.environ.get("DEFAULT_REDIRECT_PATH", FRONTEND_ONBOARDING_PATH)
+# Schema generation walks every route and resolves every model; don't serve
+# it at all in production, and precompute it in the lifespan elsewhere.
+IS_PROD = os.environ.get("ENV", "").lower() in ("prod", "production")
 
 
 def _cors_allowed_origins() -> list[str]:
@@ -134,8 +45,8 @@ def _cors_allowed_origins() -> list[str]:
     raw = os.environ.get("CORS_ALLOWED_ORIGINS")
     if raw:
         origins = [origin.strip().rstrip("/") for origin in raw.split(",") if origin.strip()]
-        return origins or [FRONTEND_ORIGIN]
-    return [FRONTEND_ORIGIN]
+        return origins or [auth.FRONTEND_ORIGIN]
+    return [auth.FRONTEND_ORIGIN]
 
 
 ALLOWED_ORIGINS = _cors_allowed_origins()
@@ -144,415 +55,108 @@ ALLOWED_ORIGINS = _cors_allowed_origins()
 # FASTAPI APP SETUP
 # -----------------------------------------------------------
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # The connectivity probe used to run at import time, delaying every forked
+    # worker's readiness; here it runs once per worker with the loop already up.
+    if engine is not None:
+        try:
+            await run_in_threadpool(ping_database)
+            print("✔ Database connection established!")
+            # One-time schema setup; repository __init__ no longer issues DDL,
+            # so constructing a repository costs no DB round-trip. Only runs
+            # when the ping succeeded — on a down DB the worker starts
+            # degraded instead of dying on the DDL.
+            for repo_cls in (UserRepository, ProfileRepository, PhotoRepository):
+                await run_in_threadpool(repo_cls.ensure_schema, engine)
+        except Exception as exc:
+            print(
+                f"⚠️  DB connectivity check failed ({exc}). "
+                "Connections are retried on checkout; DB-backed endpoints may fail."
+            )
+    # Models are declared with defer_build; force the hot-path schemas here so
+    # the build cost lands in startup, not in the first request.
+    for model in (ProfileCreate, ProfileRead, ProfileUpdate, PhotoCreate, PhotoRead, PhotoUpdate):
+        model.model_rebuild()
+    if not IS_PROD:
+        # Warm the OpenAPI schema so the first /docs visitor doesn't pay the
+        # full route walk; FastAPI caches it on app.openapi_schema.
+        app.openapi()
+    # The repositories are process-wide singletons (one pool per forked
+    # worker); exposing them on app.state lets tests swap them per app.
+    app.state.user_repository = repositories.user_repository
+    app.state.profile_repository = repositories.profile_repository
+    app.state.photo_repository = repositories.photo_repository
+    yield
+    await auth.google_http_client.aclose()
+    if async_engine is not None:
+        await async_engine.dispose()
+    if engine is not None:
+        engine.dispose()
+
+
 app = FastAPI(
     title="Users Microservice API",
     description="FastAPI app exposing resources for Profiles, Photos, and Visibility.",
     version="0.1.0",
+    # orjson handles UUID/datetime natively and skips jsonable_encoder on the body path.
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan,
+    openapi_url=None if IS_PROD else "/openapi.json",
+    docs_url=None if IS_PROD else "/docs",
+    redoc_url=None if IS_PROD else "/redoc",
 )
 
+# One clock read per request; repositories and token issuance share it via
+# utils.clock.request_now().
+app.add_middleware(RequestClockMiddleware)
+
+# Added before CORS so cached responses still get per-origin CORS headers.
+app.add_middleware(ResponseCacheMiddleware, ttls={"/health": 5.0, "/auth/me": 30.0})
+
+# Compress anything over ~one MTU; tiny health/auth payloads pass through.
+app.add_middleware(GZipMiddleware, minimum_size=500)
+
 app.add_middleware(
     CORSMiddleware,
     allow_origins=ALLOWED_ORIGINS,
     allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
+    # Explicit lists let CORSMiddleware answer preflights with a precomputed
+    # response, and max_age lets browsers cache them for a day instead of
+    # re-preflighting every SPA call.
+    allow_methods=["GET", "POST", "PUT", "PATCH", "DELETE"],
+    allow_headers=["Authorization", "Content-Type"],
+    max_age=86400,
 )
 
-# Health utility
-def make_health(echo: Optional[str], path_echo: Optional[str] = None) -> Health:
-    return Health(
-        status=200,
-        status_message="OK",
-        timestamp=datetime.utcnow().isoformat() + "Z",
-        ip_address=socket.gethostbyname(socket.gethostname()),
-        echo=echo,
-        path_echo=path_echo,
-    )
-
-# Health endpoints
-@app.get("/health", response_model=Health)
-def get_health_no_path(echo: str | None = None):
-    return make_health(echo=echo)
-
-@app.get("/health/{path_echo}", response_model=Health)
-def get_health_with_path(path_echo: str, echo: str | None = None):
-    return make_health(echo=echo, path_echo=path_echo)
-
-# ----------------------------
-# Auth endpoints
-# ----------------------------
-
-def _require_google_env() -> tuple[str, str, str]:
-    client_id = os.environ.get("GOOGLE_CLIENT_ID")
-    client_secret = os.environ.get("GOOGLE_CLIENT_SECRET")
-    redirect_uri = os.environ.get("GOOGLE_REDIRECT_URI")
-    if not client_id or not client_secret or not redirect_uri:
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Google OAuth is not configured. Set GOOGLE_CLIENT_ID, GOOGLE_CLIENT_SECRET, and GOOGLE_REDIRECT_URI.",
-    )
-    return client_id, client_secret, redirect_uri
-
-
-def _build_frontend_redirect(
-    *,
-    state: str | None,
-    next_path: str | None,
-    has_profile: bool,
-) -> str:
-    """
-    Build the URL to send the browser back into the frontend app after the backend
-    has created the session cookie.
-    """
-    query: dict[str, str] = {}
-    if next_path and next_path.startswith("/"):
-        query["next"] = next_path
-    if state:
-        query["state"] = state
-
-    if query:
-        qs = urlencode(query)
-        return f"{FRONTEND_ORIGIN}{FRONTEND_CALLBACK_PATH}?{qs}"
-
-    # Fallback to onboarding or profile depending on whether the user already has a profile.
-    target_path = FRONTEND_PROFILE_PATH if has_profile else DEFAULT_REDIRECT_PATH
-    if not target_path.startswith("/"):
-        target_path = f"/{target_path}"
-    return f"{FRONTEND_ORIGIN}{target_path}"
-
-
-def _token_response(
-    user: UserPublic,
-    *,
-    provider: str,
-    redirect_to: str | None = None,
-) -> JSONResponse | RedirectResponse:
-    profile = profile_repository.get_by_user_id(str(user.id))
-    token = create_access_token(
-        user_id=str(user.id),
-        email=user.email,
-        name=user.name,
-        provider=provider,
-    )
-    payload = {
-        "token": token,
-        "user": user.model_dump(mode="json"),
-        "profile_id": str(profile.id) if profile else None,
-    }
-    if redirect_to:
-        response = RedirectResponse(url=redirect_to, status_code=status.HTTP_302_FOUND)
-    else:
-        response = JSONResponse(payload)
-    response.set_cookie(
-        key="access_token",
-        value=token,
-        httponly=True,
-        secure=COOKIE_SECURE,
-        samesite=COOKIE_SAMESITE,
-    )
-    return response
-
-
-@app.get("/auth/google", include_in_schema=True)
-def start_google_login(state: str | None = None, next_path: str | None = Query(None, alias="next")):
-    client_id, _, redirect_uri = _require_google_env()
-    resolved_state = state or next_path
-    params = {
-        "client_id": client_id,
-        "redirect_uri": redirect_uri,
-        "response_type": "code",
-        "scope": "openid email profile",
-        "access_type": "offline",
-        "prompt": "consent",
-    }
-    if resolved_state:
-        params["state"] = resolved_state
-    prepared = requests.Request("GET", GOOGLE_AUTH_BASE, params=params).prepare()
-    return RedirectResponse(prepared.url)
-
-
-@app.get("/auth/google/callback", response_model=TokenResponse)
-def google_callback(
-    code: str = Query(...),
-    state: str | None = None,
-    next_path: str | None = Query(None, alias="next"),
-    return_json: bool = Query(
-        False,
-        description="Return JSON instead of redirecting back into the frontend app.",
-        alias="json",
-    ),
-):
-    client_id, client_secret, redirect_uri = _require_google_env()
-    token_resp = requests.post(
-        GOOGLE_TOKEN_ENDPOINT,
-        data={
-            "code": code,
-            "client_id": client_id,
-            "client_secret": client_secret,
-            "redirect_uri": redirect_uri,
-            "grant_type": "authorization_code",
-        },
-        headers={"Content-Type": "application/x-www-form-urlencoded"},
-        timeout=10,
-    )
-    if not token_resp.ok:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"Failed to exchange code: {token_resp.text}",
-        )
-    token_data = token_resp.json()
-    id_token_value = token_data.get("id_token")
-    if not id_token_value:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="id_token missing from Google response.",
-        )
-    try:
-        id_info = google_id_token.verify_oauth2_token(
-            id_token_value, google_requests.Request(), audience=client_id
-        )
-    except Exception as exc:  # noqa: BLE001
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"Failed to verify Google token: {exc}",
-        ) from exc
-
-    email = id_info.get("email")
-    if not email:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Google token did not include an email address.",
-        )
-
-    user = user_repository.upsert_google_user(
-        email=email,
-        name=id_info.get("name"),
-        google_sub=id_info.get("sub"),
-        picture=id_info.get("picture"),
-    )
-
-    profile = profile_repository.get_by_user_id(str(user.id))
-    redirect_target = (
-        None
-        if return_json
-        else _build_frontend_redirect(
-            state=state,
-            next_path=next_path,
-            has_profile=profile is not None,
-        )
-    )
-    # Pass through profile awareness so the payload includes profile_id for clients.
-    return _token_response(user, provider="google", redirect_to=redirect_target)
-
-
-@app.post("/auth/signup", response_model=TokenResponse)
-def signup(payload: SignupRequest = Body(...)):
-    try:
-        user = user_repository.create_local_user(
-            email=payload.email, password=payload.password, name=payload.name
-        )
-    except ValueError as exc:
-        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
-    return _token_response(user, provider="local")
-
-
-@app.post("/auth/login", response_model=TokenResponse)
-def login(payload: LoginRequest = Body(...)):
-    user = user_repository.verify_local_credentials(email=payload.email, password=payload.password)
-    if not user:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Invalid email or password.",
-        )
-    return _token_response(user, provider="local")
-
-
-@app.get("/auth/me", response_model=UserPublic)
-async def get_me(current_user: TokenPayload = Depends(get_current_user)):
-    user = user_repository.get_user_by_id(current_user.sub)
-    if user:
-        return user
-    try:
-        return UserPublic(
-            id=UUID(current_user.sub),
-            email=current_user.email,
-            name=current_user.name,
-            provider=current_user.provider,
-        )
-    except Exception:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="User not found.",
-        )
-
-
-@app.post("/auth/logout")
-async def logout():
-    response = JSONResponse({"detail": "Logged out"})
-    response.delete_cookie("access_token")
-    return response
-
-# ----------------------------
-# Profile endpoints
-# ----------------------------
-@app.get("/profiles/me", response_model=ProfileRead)
-def get_my_profile(current_user: TokenPayload = Depends(get_current_user)):
-    profile = profile_repository.get_by_user_id(current_user.sub)
-    if not profile:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Profile not found.")
-    return profile
-
-
-@app.get("/profiles/{profile_id}", response_model=ProfileRead)
-def get_profile(profile_id: UUID, current_user: TokenPayload = Depends(get_current_user)):
-    profile = profile_repository.get_by_id(str(profile_id))
-    if not profile:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Profile not found.")
-    if str(profile.user_id) != current_user.sub:
-        # Only owner can fetch; relax this later if profiles become public.
-        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Forbidden.")
-    return profile
-
-
-@app.post("/profiles", response_model=ProfileRead, status_code=201)
-def create_profile(profile: ProfileCreate, current_user: TokenPayload = Depends(get_current_user)):
-    existing = profile_repository.get_by_user_id(current_user.sub)
-    if existing:
-        raise HTTPException(
-            status_code=status.HTTP_409_CONFLICT,
-            detail="Profile already exists for this user.",
-        )
-    created = profile_repository.create_profile(user_id=current_user.sub, payload=profile)
-    return created
+app.include_router(health.router)
+app.include_router(auth.router)
+app.include_router(profiles.router)
+app.include_router(photos.router)
+app.include_router(visibility.router)
 
 
-@app.put("/profiles/me", response_model=ProfileRead)
-def update_my_profile(update: ProfileUpdate, current_user: TokenPayload = Depends(get_current_user)):
-    existing = profile_repository.get_by_user_id(current_user.sub)
-    if not existing:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Profile not found.")
-    updated = profile_repository.update_profile(
-        profile_id=str(existing.id),
-        user_id=current_user.sub,
-        update=update,
-    )
-    if not updated:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Profile not found.")
-    return updated
-
-
-@app.delete("/profiles/me", status_code=204)
-def delete_my_profile(current_user: TokenPayload = Depends(get_current_user)):
-    existing = profile_repository.get_by_user_id(current_user.sub)
-    if not existing:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Profile not found.")
-    deleted = profile_repository.delete_profile(
-        profile_id=str(existing.id),
-        user_id=current_user.sub,
-    )
-    if not deleted:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Profile not found.")
-    return Response(status_code=status.HTTP_204_NO_CONTENT)
-
-# ----------------------------
-# Photos endpoints (stubs)
-# ----------------------------
-def _assert_profile_owner(profile_id: str, current_user: TokenPayload):
-    profile = profile_repository.get_by_id(str(profile_id))
-    if not profile:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Profile not found.")
-    if str(profile.user_id) != current_user.sub:
-        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Forbidden.")
-    return profile
-
-
-@app.get("/photos", response_model=list[PhotoRead])
-def list_photos(
-    profile_id: UUID | None = Query(None),
-    current_user: TokenPayload = Depends(get_current_user),
-):
-    target_profile = (
-        profile_repository.get_by_user_id(current_user.sub)
-        if profile_id is None
-        else _assert_profile_owner(str(profile_id), current_user)
-    )
-    if not target_profile:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Profile not found.")
-    return photo_repository.list_by_profile(str(target_profile.id))
-
-
-@app.get("/photos/{photo_id}", response_model=PhotoRead)
-def get_photo(photo_id: UUID, current_user: TokenPayload = Depends(get_current_user)):
-    photo = photo_repository.get(str(photo_id))
-    if not photo:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Photo not found.")
-    _assert_profile_owner(str(photo.profile_id), current_user)
-    return photo
-
-
-@app.post("/photos", response_model=PhotoRead, status_code=201)
-def create_photo(photo: PhotoCreate, current_user: TokenPayload = Depends(get_current_user)):
-    _assert_profile_owner(str(photo.profile_id), current_user)
-    created = photo_repository.create(photo)
-    return created
-
-
-@app.put("/photos/{photo_id}", response_model=PhotoRead)
-def update_photo(
-    photo_id: UUID,
-    update: PhotoUpdate,
-    current_user: TokenPayload = Depends(get_current_user),
-):
-    existing = photo_repository.get(str(photo_id))
-    if not existing:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Photo not found.")
-    _assert_profile_owner(str(existing.profile_id), current_user)
-    updated = photo_repository.update(str(photo_id), update)
-    if not updated:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Photo not found.")
-    return updated
-
-
-@app.delete("/photos/{photo_id}", status_code=204)
-def delete_photo(photo_id: UUID, current_user: TokenPayload = Depends(get_current_user)):
-    existing = photo_repository.get(str(photo_id))
-    if not existing:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Photo not found.")
-    _assert_profile_owner(str(existing.profile_id), current_user)
-    deleted = photo_repository.delete(str(photo_id))
-    if not deleted:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Photo not found.")
-    return Response(status_code=status.HTTP_204_NO_CONTENT)
-
-# ----------------------------
-# Visibility endpoints (stubs)
-# ----------------------------
-@app.get("/visibility", response_model=list[VisibilityRead])
-def list_visibility():
-    raise HTTPException(status_code=501, detail="Not implemented")
-
-@app.get("/visibility/{visibility_id}", response_model=VisibilityRead)
-def get_visibility(visibility_id: UUID):
-    raise HTTPException(status_code=501, detail="Not implemented")
-
-@app.post("/visibility", response_model=VisibilityRead, status_code=201)
-def create_visibility(visibility: VisibilityCreate):
-    return VisibilityRead(**visibility.model_dump())
-
-@app.put("/visibility/{visibility_id}", response_model=VisibilityRead)
-def update_visibility(visibility_id: UUID, update: VisibilityUpdate):
-    raise HTTPException(status_code=501, detail="Not implemented")
-
-@app.delete("/visibility/{visibility_id}", status_code=204)
-def delete_visibility(visibility_id: UUID):
-    raise HTTPException(status_code=501, detail="Not implemented")
-
 # Root endpoint
 @app.get("/")
-def root():
+async def root():
     return {"message": "Welcome to the Users API. See /docs for OpenAPI UI."}
 
+
 # FastAPI entrypoint
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run("main:app", host="0.0.0.0", port=port, reload=False)
+
+    # 2n+1 workers saturate the cores; the engine and repositories are created
+    # at module level, so each forked worker builds its own MySQL pool rather
+    # than sharing connections across forks.
+    workers = int(os.environ.get("WEB_CONCURRENCY", (os.cpu_count() or 1) * 2 + 1))
+    uvicorn.run(
+        "main:app",
+        host="0.0.0.0",
+        port=port,
+        workers=workers,
+        loop="uvloop",
+        http="httptools",
+        log_level="warning",
+    )
@@ -0,0 +1,19 @@
+from __future__ import annotations
+
+from utils.clock import REQUEST_NOW, utcnow
+
+
+class RequestClockMiddleware:
+    """Pure ASGI middleware that stamps REQUEST_NOW once per request.
+
+    Downstream code (repositories, token issuance) reads the context var via
+    utils.clock.request_now() instead of calling the system clock repeatedly.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http":
+            REQUEST_NOW.set(utcnow())
+        await self.app(scope, receive, send)
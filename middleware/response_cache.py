@@ -0,0 +1,103 @@
+from __future__ import annotations
+
+import hashlib
+import time
+from typing import Dict, Optional, Tuple
+
+# Cached entry: (expires_at, status, headers, body)
+_CacheEntry = Tuple[float, int, list, bytes]
+
+
+class ResponseCacheMiddleware:
+    """
+    Tiny in-process TTL cache for idempotent GET endpoints (pure ASGI).
+
+    /health is hammered by load-balancer probes and /auth/me is polled by the
+    SPA; both are stable within a few seconds, so serving them from memory
+    skips the handler (and any DB hit) entirely. Responses for authenticated
+    paths are keyed per credential so users never see each other's payloads,
+    and any mutating request from the same credential drops its entries.
+    """
+
+    def __init__(self, app, ttls: Optional[Dict[str, float]] = None, max_entries: int = 1024):
+        self.app = app
+        # path -> TTL seconds; /health/{path_echo} variants share the /health TTL.
+        self.ttls = ttls or {"/health": 5.0, "/auth/me": 30.0}
+        self.max_entries = max_entries
+        self._cache: Dict[str, _CacheEntry] = {}
+
+    def _ttl_for(self, path: str) -> Optional[float]:
+        ttl = self.ttls.get(path)
+        if ttl is None and path.startswith("/health/"):
+            ttl = self.ttls.get("/health")
+        return ttl
+
+    @staticmethod
+    def _credential(scope) -> str:
+        """Stable, non-reversible key component for the caller's token."""
+        token = b""
+        for name, value in scope.get("headers", []):
+            if name == b"authorization":
+                token = value
+                break
+            if name == b"cookie" and b"access_token=" in value:
+                token = value
+        return hashlib.sha256(token).hexdigest() if token else ""
+
+    def _drop_credential(self, credential: str) -> None:
+        if not credential:
+            return
+        stale = [key for key in self._cache if key.endswith(credential)]
+        for key in stale:
+            self._cache.pop(key, None)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        path = scope["path"]
+        method = scope["method"]
+
+        if method != "GET":
+            # A mutation may change what /auth/me would return for this caller.
+            self._drop_credential(self._credential(scope))
+            await self.app(scope, receive, send)
+            return
+
+        ttl = self._ttl_for(path)
+        if ttl is None:
+            await self.app(scope, receive, send)
+            return
+
+        credential = self._credential(scope)
+        key = f"{path}?{scope.get('query_string', b'').decode()}#{credential}"
+
+        entry = self._cache.get(key)
+        now = time.monotonic()
+        if entry and entry[0] > now:
+            _, status, headers, body = entry
+            await send({"type": "http.response.start", "status": status, "headers": headers})
+            await send({"type": "http.response.body", "body": body})
+            return
+
+        captured = {"status": 0, "headers": [], "body": b""}
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                captured["status"] = message["status"]
+                captured["headers"] = list(message.get("headers", []))
+            elif message["type"] == "http.response.body":
+                captured["body"] += message.get("body", b"")
+                if not message.get("more_body", False) and captured["status"] == 200:
+                    if len(self._cache) >= self.max_entries:
+                        self._cache.clear()
+                    self._cache[key] = (
+                        time.monotonic() + ttl,
+                        captured["status"],
+                        captured["headers"],
+                        captured["body"],
+                    )
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
@@ -3,9 +3,29 @@ from __future__ import annotations
 from typing import Optional
 from uuid import UUID, uuid4
 from datetime import datetime
+
+import msgspec
 from pydantic import BaseModel, Field
 
 
+class PhotoOut(msgspec.Struct):
+    """msgspec twin of PhotoRead for the hot read path.
+
+    Repositories build these straight from trusted rows — construction is a
+    C-level slot fill with no validation pass — and the routers encode them
+    with msgspec rather than pydantic. PhotoRead stays the OpenAPI schema.
+    """
+
+    photo_id: str
+    profile_id: str
+    url: str
+    is_primary: bool
+    uploaded_at: datetime
+    created_at: datetime
+    updated_at: datetime
+    description: Optional[str] = None
+
+
 class PhotoBase(BaseModel):
     photo_id: UUID = Field(
         default_factory=uuid4,
@@ -39,6 +59,7 @@ class PhotoBase(BaseModel):
     )
 
     model_config = {
+        "defer_build": True,
         "json_schema_extra": {
             "examples": [
                 {
@@ -56,6 +77,18 @@ class PhotoBase(BaseModel):
 
 class PhotoCreate(PhotoBase):
     """Creation payload; ID is generated server-side but present in the base model."""
+    # The server regenerates the id and fills uploaded_at itself, so there is
+    # no point paying a uuid4()/utcnow() default-factory call per request.
+    photo_id: Optional[UUID] = Field(
+        None,
+        description="Ignored on create; the server generates the ID.",
+    )
+    uploaded_at: Optional[datetime] = Field(
+        None,
+        description="Timestamp when the photo was uploaded (UTC); defaults to now.",
+        json_schema_extra={"example": "2025-10-18T17:45:23Z"},
+    )
+
     model_config = {
         "json_schema_extra": {
             "examples": [
@@ -77,6 +110,7 @@ class PhotoUpdate(BaseModel):
     description: Optional[str] = Field(None, json_schema_extra={"example": "An updated description."})
 
     model_config = {
+        "defer_build": True,
         "json_schema_extra": {
             "examples": [
                 {"url": "https://example.com/photos/updated_photo.jpg"},
@@ -89,12 +123,12 @@ class PhotoUpdate(BaseModel):
 
 class PhotoRead(PhotoBase):
     created_at: datetime = Field(
-        default_factory=datetime.utcnow,
+        ...,
         description="Creation timestamp (UTC).",
         json_schema_extra={"example": "2025-01-15T10:20:30Z"},
     )
     updated_at: datetime = Field(
-        default_factory=datetime.utcnow,
+        ...,
         description="Last update timestamp (UTC).",
         json_schema_extra={"example": "2025-01-16T12:00:00Z"},
     )
@@ -3,9 +3,32 @@ from __future__ import annotations
 from typing import Optional, List, Annotated
 from uuid import UUID, uuid4
 from datetime import date, datetime
+import msgspec
 from pydantic import BaseModel, Field, EmailStr, StringConstraints
 
 
+class ProfileOut(msgspec.Struct):
+    """msgspec twin of ProfileRead for the hot read path.
+
+    Repositories build these straight from trusted rows — construction is a
+    C-level slot fill with no validation pass — and the routers encode them
+    with msgspec rather than pydantic. ProfileRead stays the OpenAPI schema.
+    """
+
+    id: str
+    user_id: str
+    first_name: str
+    last_name: str
+    email: str
+    created_at: datetime
+    updated_at: datetime
+    phone: Optional[str] = None
+    birth_date: Optional[date] = None
+    gender: Optional[str] = None
+    location: Optional[str] = None
+    bio: Optional[str] = None
+
+
 class ProfileBase(BaseModel):
     first_name: str = Field(
         ...,
@@ -49,6 +72,7 @@ class ProfileBase(BaseModel):
     )
 
     model_config = {
+        "defer_build": True,
         "json_schema_extra": {
             "examples": [
                 {
@@ -95,6 +119,7 @@ class ProfileUpdate(BaseModel):
     bio: Optional[str] = Field(None, json_schema_extra={"example": "Aspiring founder."})
 
     model_config = {
+        "defer_build": True,
         "json_schema_extra": {
             "examples": [
                 {"first_name": "Ada", "last_name": "Byron"},
@@ -108,22 +133,22 @@ class ProfileUpdate(BaseModel):
 class ProfileRead(ProfileBase):
     """Server representation returned to clients."""
     id: UUID = Field(
-        default_factory=uuid4,
+        ...,
         description="Server-generated Profile ID.",
         json_schema_extra={"example": "99999999-9999-4999-8999-999999999999"},
     )
     user_id: UUID = Field(
-        default_factory=uuid4,
+        ...,
         description="User owner ID for this profile.",
         json_schema_extra={"example": "11111111-2222-4333-8444-555555555555"},
     )
     created_at: datetime = Field(
-        default_factory=datetime.utcnow,
+        ...,
         description="Creation timestamp (UTC).",
         json_schema_extra={"example": "2025-01-15T10:20:30Z"},
     )
     updated_at: datetime = Field(
-        default_factory=datetime.utcnow,
+        ...,
         description="Last update timestamp (UTC).",
         json_schema_extra={"example": "2025-01-16T12:00:00Z"},
     )
@@ -4,9 +4,26 @@ from datetime import datetime
 from typing import Optional
 from uuid import UUID, uuid4
 
+import msgspec
 from pydantic import BaseModel, EmailStr, Field
 
 
+class UserOut(msgspec.Struct):
+    """msgspec twin of UserPublic for the hot read path.
+
+    Repositories build these straight from trusted rows — construction is a
+    C-level slot fill with no validation pass — and the routers encode them
+    with msgspec rather than pydantic. UserPublic stays the OpenAPI schema.
+    """
+
+    id: str
+    email: str
+    provider: str
+    name: Optional[str] = None
+    picture: Optional[str] = None
+    last_login: Optional[datetime] = None
+
+
 class UserPublic(BaseModel):
     """Public representation of a user returned to clients."""
 
@@ -1,7 +1,11 @@
 from pydantic import BaseModel, Field
 from uuid import UUID, uuid4
 from datetime import datetime
-from typing import Optional
+from typing import Literal, Optional
+
+# Closed value set: pydantic-core validates Literal with an interned-string
+# table lookup instead of accepting arbitrary strings.
+VisibilityScope = Literal["close", "normal", "wide"]
 
 
 class VisibilityBase(BaseModel):
@@ -11,9 +15,9 @@ class VisibilityBase(BaseModel):
         description="Indicates whether the profile is currently visible.",
         json_schema_extra={"example": True},
     )
-    visibility_scope: Optional[str] = Field(
+    visibility_scope: Optional[VisibilityScope] = Field(
         "normal",
-        description="Visibility level (e.g., close, normal, wide).",
+        description="Visibility level (close, normal, or wide).",
         json_schema_extra={"example": "normal"},
     )
     last_toggled_at: datetime = Field(
@@ -23,6 +27,7 @@ class VisibilityBase(BaseModel):
     )
 
     model_config = {
+        "defer_build": True,
         "json_schema_extra": {
             "examples": [
                 {
@@ -51,9 +56,9 @@ class VisibilityUpdate(BaseModel):
         description="Set to true/false to toggle visibility.",
         json_schema_extra={"example": False},
     )
-    visibility_scope: Optional[str] = Field(
+    visibility_scope: Optional[VisibilityScope] = Field(
         None,
-        description="Update visibility level (e.g., close, normal, wide).",
+        description="Update visibility level (close, normal, or wide).",
         json_schema_extra={"example": "close"},
     )
     last_toggled_at: Optional[datetime] = Field(
@@ -77,6 +82,7 @@ class VisibilityRead(VisibilityBase):
     )
 
     model_config = {
+        "defer_build": True,
         "json_schema_extra": {
             "examples": [
                 {
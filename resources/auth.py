@@ -0,0 +1,324 @@
+from __future__ import annotations
+
+import os
+import time
+from typing import Optional
+from urllib.parse import urlencode
+
+import httpx
+import msgspec
+import requests
+from fastapi import APIRouter, Body, Depends, HTTPException, Query, status
+from fastapi.responses import ORJSONResponse, RedirectResponse, Response
+from starlette.concurrency import run_in_threadpool
+from google.auth import jwt as google_jwt
+
+from framework.responses import struct_response
+from models.profile import ProfileOut
+from models.user import LoginRequest, SignupRequest, TokenResponse, UserOut, UserPublic
+from services.repositories import profile_repository, user_repository
+from utils.auth import TokenPayload, create_access_token, get_current_user
+
+router = APIRouter(tags=["auth"])
+
+GOOGLE_AUTH_BASE = "https://accounts.google.com/o/oauth2/v2/auth"
+GOOGLE_TOKEN_ENDPOINT = "https://oauth2.googleapis.com/token"
+
+# Shared client so repeat logins reuse pooled TLS connections to Google
+# instead of paying a fresh handshake per token exchange. Closed from the
+# app lifespan on shutdown.
+google_http_client = httpx.AsyncClient(
+    timeout=10, limits=httpx.Limits(max_keepalive_connections=20)
+)
+
+# Google's signing certs rotate roughly daily, so a 1-hour cache is safe and
+# turns most ID-token verifications into pure CPU with no network round trip.
+GOOGLE_CERTS_URL = "https://www.googleapis.com/oauth2/v1/certs"
+GOOGLE_CERTS_TTL_SECONDS = 3600
+_google_certs: dict = {}
+_google_certs_fetched_at = 0.0
+
+
+def _get_google_certs(force_refresh: bool = False) -> dict:
+    global _google_certs, _google_certs_fetched_at
+    now = time.monotonic()
+    if (
+        force_refresh
+        or not _google_certs
+        or now - _google_certs_fetched_at > GOOGLE_CERTS_TTL_SECONDS
+    ):
+        resp = requests.get(GOOGLE_CERTS_URL, timeout=10)
+        resp.raise_for_status()
+        _google_certs = resp.json()
+        _google_certs_fetched_at = now
+    return _google_certs
+
+
+def _verify_google_id_token(id_token_value: str, client_id: str) -> dict:
+    """Verify signature/audience/expiry against the cached Google certs."""
+    try:
+        return google_jwt.decode(id_token_value, certs=_get_google_certs(), audience=client_id)
+    except ValueError:
+        # Possibly signed by a freshly rotated key; refresh the certs once and retry.
+        return google_jwt.decode(
+            id_token_value, certs=_get_google_certs(force_refresh=True), audience=client_id
+        )
+
+
+COOKIE_SECURE = os.environ.get("COOKIE_SECURE", "").lower() in ("1", "true", "yes")
+COOKIE_SAMESITE = "none" if COOKIE_SECURE else "lax"
+FRONTEND_ORIGIN = os.environ.get(
+    "FRONTEND_ORIGIN", "https://nice2meetu-webapp.storage.googleapis.com"
+).rstrip("/")
+FRONTEND_CALLBACK_PATH = os.environ.get("FRONTEND_CALLBACK_PATH", "/auth/google/callback")
+FRONTEND_PROFILE_PATH = os.environ.get("FRONTEND_PROFILE_PATH", "/profile/index.html")
+FRONTEND_ONBOARDING_PATH = os.environ.get("DEFAULT_REDIRECT_PATH") or os.environ.get(
+    "FRONTEND_ONBOARDING_PATH", "/onboarding"
+)
+DEFAULT_REDIRECT_PATH = os.environ.get("DEFAULT_REDIRECT_PATH", FRONTEND_ONBOARDING_PATH)
+
+
+def _require_google_env() -> tuple[str, str, str]:
+    client_id = os.environ.get("GOOGLE_CLIENT_ID")
+    client_secret = os.environ.get("GOOGLE_CLIENT_SECRET")
+    redirect_uri = os.environ.get("GOOGLE_REDIRECT_URI")
+    if not client_id or not client_secret or not redirect_uri:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Google OAuth is not configured. Set GOOGLE_CLIENT_ID, GOOGLE_CLIENT_SECRET, and GOOGLE_REDIRECT_URI.",
+    )
+    return client_id, client_secret, redirect_uri
+
+
+def _frontend_url(path: str) -> str:
+    if not path.startswith("/"):
+        path = f"/{path}"
+    return f"{FRONTEND_ORIGIN}{path}"
+
+
+# Precomputed destinations for the common callback case (no state/next), which
+# covers the vast majority of logins.
+_PROFILE_URL = _frontend_url(FRONTEND_PROFILE_PATH)
+_ONBOARDING_URL = _frontend_url(DEFAULT_REDIRECT_PATH)
+
+
+def _build_frontend_redirect(
+    *,
+    state: str | None,
+    next_path: str | None,
+    has_profile: bool,
+) -> str:
+    """
+    Build the URL to send the browser back into the frontend app after the backend
+    has created the session cookie.
+    """
+    if not state and not next_path:
+        # Fallback to onboarding or profile depending on whether the user already has a profile.
+        return _PROFILE_URL if has_profile else _ONBOARDING_URL
+
+    query: dict[str, str] = {}
+    if next_path and next_path.startswith("/"):
+        query["next"] = next_path
+    if state:
+        query["state"] = state
+
+    if query:
+        qs = urlencode(query)
+        return f"{FRONTEND_ORIGIN}{FRONTEND_CALLBACK_PATH}?{qs}"
+    return _PROFILE_URL if has_profile else _ONBOARDING_URL
+
+
+_TOKEN_ENCODER = msgspec.json.Encoder()
+
+
+# Sentinel distinguishing "caller didn't look up the profile" from a known None.
+_PROFILE_UNSET = object()
+
+
+async def _token_response(
+    user: UserOut,
+    *,
+    provider: str,
+    redirect_to: str | None = None,
+    profile: ProfileOut | None | object = _PROFILE_UNSET,
+) -> Response | RedirectResponse:
+    if profile is _PROFILE_UNSET:
+        profile = await profile_repository.get_by_user_id(str(user.id))
+    token = create_access_token(
+        user_id=str(user.id),
+        email=user.email,
+        name=user.name,
+        provider=provider,
+    )
+    if redirect_to:
+        response = RedirectResponse(url=redirect_to, status_code=status.HTTP_302_FOUND)
+    else:
+        body = _TOKEN_ENCODER.encode(
+            {
+                "token": token,
+                "user": user,
+                "profile_id": str(profile.id) if profile else None,
+            }
+        )
+        response = Response(content=body, media_type="application/json")
+    response.set_cookie(
+        key="access_token",
+        value=token,
+        httponly=True,
+        secure=COOKIE_SECURE,
+        samesite=COOKIE_SAMESITE,
+    )
+    return response
+
+
+# Everything but `state` in the authorization URL is constant per process, so
+# the encoded prefix is built once instead of re-encoding on every login start.
+_google_auth_url_prefix: str | None = None
+
+
+def _google_auth_url(state: str | None) -> str:
+    global _google_auth_url_prefix
+    if _google_auth_url_prefix is None:
+        client_id, _, redirect_uri = _require_google_env()
+        _google_auth_url_prefix = GOOGLE_AUTH_BASE + "?" + urlencode(
+            {
+                "client_id": client_id,
+                "redirect_uri": redirect_uri,
+                "response_type": "code",
+                "scope": "openid email profile",
+                "access_type": "offline",
+                "prompt": "consent",
+            }
+        )
+    if state:
+        return f"{_google_auth_url_prefix}&{urlencode({'state': state})}"
+    return _google_auth_url_prefix
+
+
+@router.get("/auth/google", include_in_schema=True)
+async def start_google_login(state: str | None = None, next_path: str | None = Query(None, alias="next")):
+    return RedirectResponse(_google_auth_url(state or next_path))
+
+
+@router.get("/auth/google/callback", response_model=TokenResponse)
+async def google_callback(
+    code: str = Query(...),
+    state: str | None = None,
+    next_path: str | None = Query(None, alias="next"),
+    return_json: bool = Query(
+        False,
+        description="Return JSON instead of redirecting back into the frontend app.",
+        alias="json",
+    ),
+):
+    client_id, client_secret, redirect_uri = _require_google_env()
+    token_resp = await google_http_client.post(
+        GOOGLE_TOKEN_ENDPOINT,
+        data={
+            "code": code,
+            "client_id": client_id,
+            "client_secret": client_secret,
+            "redirect_uri": redirect_uri,
+            "grant_type": "authorization_code",
+        },
+        headers={"Content-Type": "application/x-www-form-urlencoded"},
+    )
+    if not token_resp.is_success:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Failed to exchange code: {token_resp.text}",
+        )
+    token_data = token_resp.json()
+    id_token_value = token_data.get("id_token")
+    if not id_token_value:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="id_token missing from Google response.",
+        )
+    try:
+        # Cert fetch (cache miss only) + RSA verify, both off the event loop.
+        id_info = await run_in_threadpool(_verify_google_id_token, id_token_value, client_id)
+    except Exception as exc:  # noqa: BLE001
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Failed to verify Google token: {exc}",
+        ) from exc
+
+    email = id_info.get("email")
+    if not email:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Google token did not include an email address.",
+        )
+
+    user = await user_repository.upsert_google_user(
+        email=email,
+        name=id_info.get("name"),
+        google_sub=id_info.get("sub"),
+        picture=id_info.get("picture"),
+    )
+
+    profile = await profile_repository.get_by_user_id(str(user.id))
+    redirect_target = (
+        None
+        if return_json
+        else _build_frontend_redirect(
+            state=state,
+            next_path=next_path,
+            has_profile=profile is not None,
+        )
+    )
+    # Reuse the profile fetched above instead of a second identical DB round trip.
+    return await _token_response(
+        user, provider="google", redirect_to=redirect_target, profile=profile
+    )
+
+
+@router.post("/auth/signup", response_model=TokenResponse)
+async def signup(payload: SignupRequest = Body(...)):
+    try:
+        # The repository hashes the password in the threadpool itself.
+        user = await user_repository.create_local_user(
+            email=payload.email, password=payload.password, name=payload.name
+        )
+    except ValueError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
+    # A freshly created user cannot have a profile yet; skip the lookup.
+    return await _token_response(user, provider="local", profile=None)
+
+
+@router.post("/auth/login", response_model=TokenResponse)
+async def login(payload: LoginRequest = Body(...)):
+    user = await user_repository.verify_local_credentials(
+        email=payload.email, password=payload.password
+    )
+    if not user:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid email or password.",
+        )
+    return await _token_response(user, provider="local")
+
+
+@router.get("/auth/me", response_model=UserPublic)
+async def get_me(current_user: TokenPayload = Depends(get_current_user)):
+    # The repository keeps a short TTL cache keyed on user_id (invalidated on
+    # writes), so hot lookups resolve without a DB round-trip.
+    user = await user_repository.get_user_by_id(current_user.sub)
+    if user is None:
+        # Token is valid but the row is gone (or the fallback store restarted);
+        # echo the claims so the session stays usable.
+        user = UserOut(
+            id=current_user.sub,
+            email=current_user.email,
+            name=current_user.name,
+            provider=current_user.provider,
+        )
+    return struct_response(user)
+
+
+@router.post("/auth/logout")
+async def logout():
+    response = ORJSONResponse({"detail": "Logged out"})
+    response.delete_cookie("access_token")
+    return response
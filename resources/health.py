@@ -0,0 +1,41 @@
+from __future__ import annotations
+
+import socket
+from datetime import datetime, timezone
+from typing import Optional
+
+from fastapi import APIRouter
+
+from models.health import Health
+
+router = APIRouter(tags=["health"])
+
+try:
+    # The host IP never changes for the life of the process; resolving it per
+    # request would hit the resolver (and block the event loop) on every probe.
+    LOCAL_IP = socket.gethostbyname(socket.gethostname())
+except OSError:
+    LOCAL_IP = "127.0.0.1"
+
+
+def make_health(echo: Optional[str], path_echo: Optional[str] = None) -> Health:
+    # All fields are server-generated and trusted, so skip Pydantic validation
+    # on this load-balancer-hammered path.
+    return Health.model_construct(
+        status=200,
+        status_message="OK",
+        timestamp=datetime.now(timezone.utc).isoformat(),
+        ip_address=LOCAL_IP,
+        echo=echo,
+        path_echo=path_echo,
+    )
+
+
+@router.get("/health", response_model=Health)
+async def get_health_no_path(echo: str | None = None):
+    return make_health(echo=echo)
+
+
+@router.get("/health/{path_echo}", response_model=Health)
+async def get_health_with_path(path_echo: str, echo: str | None = None):
+    return make_health(echo=echo, path_echo=path_echo)
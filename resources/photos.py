@@ -0,0 +1,103 @@
+from __future__ import annotations
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from fastapi.responses import Response
+
+from framework.bodies import body_schema, parse_body
+from framework.converters import UUID_PATTERN
+from framework.responses import not_modified, struct_response, weak_etag
+from models.photos import PhotoCreate, PhotoRead, PhotoUpdate
+from services.repositories import photo_repository, profile_repository
+from utils.auth import TokenPayload, get_current_user
+
+router = APIRouter(tags=["photos"])
+
+
+async def _assert_profile_owner(profile_id: str, current_user: TokenPayload):
+    profile = await profile_repository.get_by_id(str(profile_id))
+    if not profile:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Profile not found.")
+    if str(profile.user_id) != current_user.sub:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Forbidden.")
+    return profile
+
+
+@router.get("/photos", response_model=list[PhotoRead])
+async def list_photos(
+    request: Request,
+    profile_id: str | None = Query(None, pattern=UUID_PATTERN),
+    current_user: TokenPayload = Depends(get_current_user),
+):
+    target_profile = (
+        await profile_repository.get_by_user_id(current_user.sub)
+        if profile_id is None
+        else await _assert_profile_owner(profile_id, current_user)
+    )
+    if not target_profile:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Profile not found.")
+    photos = await photo_repository.list_by_profile(str(target_profile.id))
+    # Count + latest write together pin down the collection state.
+    latest = max((photo.updated_at for photo in photos), default=None)
+    etag = weak_etag(f"{target_profile.id}-{len(photos)}", latest) if latest else None
+    if etag:
+        if request.headers.get("if-none-match") == etag:
+            return not_modified(etag)
+        return struct_response(photos, headers={"ETag": etag})
+    return struct_response(photos)
+
+
+@router.get("/photos/{photo_id:uuid_str}", response_model=PhotoRead)
+async def get_photo(
+    request: Request,
+    photo_id: str,
+    current_user: TokenPayload = Depends(get_current_user),
+):
+    photo = await photo_repository.get(photo_id)
+    if not photo:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Photo not found.")
+    await _assert_profile_owner(str(photo.profile_id), current_user)
+    etag = weak_etag(photo.photo_id, photo.updated_at)
+    if request.headers.get("if-none-match") == etag:
+        return not_modified(etag)
+    return struct_response(photo, headers={"ETag": etag})
+
+
+@router.post(
+    "/photos",
+    response_model=PhotoRead,
+    status_code=201,
+    openapi_extra=body_schema(PhotoCreate),
+)
+async def create_photo(request: Request, current_user: TokenPayload = Depends(get_current_user)):
+    photo = await parse_body(request, PhotoCreate)
+    await _assert_profile_owner(str(photo.profile_id), current_user)
+    created = await photo_repository.create(photo)
+    return struct_response(created, status_code=201)
+
+
+@router.put("/photos/{photo_id:uuid_str}", response_model=PhotoRead)
+async def update_photo(
+    photo_id: str,
+    update: PhotoUpdate,
+    current_user: TokenPayload = Depends(get_current_user),
+):
+    existing = await photo_repository.get(photo_id)
+    if not existing:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Photo not found.")
+    await _assert_profile_owner(str(existing.profile_id), current_user)
+    updated = await photo_repository.update(photo_id, update, existing=existing)
+    if not updated:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Photo not found.")
+    return struct_response(updated)
+
+
+@router.delete("/photos/{photo_id:uuid_str}", status_code=204)
+async def delete_photo(photo_id: str, current_user: TokenPayload = Depends(get_current_user)):
+    existing = await photo_repository.get(photo_id)
+    if not existing:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Photo not found.")
+    await _assert_profile_owner(str(existing.profile_id), current_user)
+    deleted = await photo_repository.delete(photo_id)
+    if not deleted:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Photo not found.")
+    return Response(status_code=status.HTTP_204_NO_CONTENT)
@@ -0,0 +1,102 @@
+from __future__ import annotations
+
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from fastapi.responses import Response
+
+from framework.bodies import body_schema, parse_body
+from framework.responses import not_modified, struct_response, weak_etag
+from models.profile import ProfileCreate, ProfileRead, ProfileUpdate
+from services.database import get_connection
+from services.repositories import profile_repository
+from utils.auth import TokenPayload, get_current_user
+
+router = APIRouter(tags=["profiles"])
+
+
+@router.get("/profiles/me", response_model=ProfileRead)
+async def get_my_profile(
+    request: Request,
+    current_user: TokenPayload = Depends(get_current_user),
+    conn=Depends(get_connection),
+):
+    profile = await profile_repository.get_by_user_id(current_user.sub, conn=conn)
+    if not profile:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Profile not found.")
+    etag = weak_etag(profile.id, profile.updated_at)
+    if request.headers.get("if-none-match") == etag:
+        return not_modified(etag)
+    return struct_response(profile, headers={"ETag": etag})
+
+
+@router.get("/profiles/{profile_id:uuid_str}", response_model=ProfileRead)
+async def get_profile(
+    request: Request,
+    profile_id: str,
+    current_user: TokenPayload = Depends(get_current_user),
+    conn=Depends(get_connection),
+):
+    profile = await profile_repository.get_by_id(profile_id, conn=conn)
+    if not profile:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Profile not found.")
+    if str(profile.user_id) != current_user.sub:
+        # Only owner can fetch; relax this later if profiles become public.
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Forbidden.")
+    etag = weak_etag(profile.id, profile.updated_at)
+    if request.headers.get("if-none-match") == etag:
+        return not_modified(etag)
+    return struct_response(profile, headers={"ETag": etag})
+
+
+@router.post(
+    "/profiles",
+    response_model=ProfileRead,
+    status_code=201,
+    openapi_extra=body_schema(ProfileCreate),
+)
+async def create_profile(request: Request, current_user: TokenPayload = Depends(get_current_user)):
+    profile = await parse_body(request, ProfileCreate)
+    created = await profile_repository.create_profile_if_absent(
+        user_id=current_user.sub, payload=profile
+    )
+    if created is None:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Profile already exists for this user.",
+        )
+    return struct_response(created, status_code=201)
+
+
+@router.put("/profiles/me", response_model=ProfileRead)
+async def update_my_profile(
+    update: ProfileUpdate,
+    current_user: TokenPayload = Depends(get_current_user),
+    conn=Depends(get_connection),
+):
+    existing = await profile_repository.get_by_user_id(current_user.sub, conn=conn)
+    if not existing:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Profile not found.")
+    updated = await profile_repository.update_profile(
+        profile_id=str(existing.id),
+        user_id=current_user.sub,
+        update=update,
+    )
+    if not updated:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Profile not found.")
+    return struct_response(updated)
+
+
+@router.delete("/profiles/me", status_code=204)
+async def delete_my_profile(
+    current_user: TokenPayload = Depends(get_current_user),
+    conn=Depends(get_connection),
+):
+    existing = await profile_repository.get_by_user_id(current_user.sub, conn=conn)
+    if not existing:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Profile not found.")
+    deleted = await profile_repository.delete_profile(
+        profile_id=str(existing.id),
+        user_id=current_user.sub,
+    )
+    if not deleted:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Profile not found.")
+    return Response(status_code=status.HTTP_204_NO_CONTENT)
@@ -0,0 +1,42 @@
+from __future__ import annotations
+
+from fastapi import APIRouter, HTTPException, Request
+
+from framework.bodies import body_schema, parse_body
+from framework.responses import model_response
+from models.visibility import VisibilityCreate, VisibilityRead, VisibilityUpdate
+
+router = APIRouter(tags=["visibility"])
+
+
+@router.get("/visibility", response_model=list[VisibilityRead])
+async def list_visibility():
+    raise HTTPException(status_code=501, detail="Not implemented")
+
+
+@router.get("/visibility/{visibility_id:uuid_str}", response_model=VisibilityRead)
+async def get_visibility(visibility_id: str):
+    raise HTTPException(status_code=501, detail="Not implemented")
+
+
+@router.post(
+    "/visibility",
+    response_model=VisibilityRead,
+    status_code=201,
+    openapi_extra=body_schema(VisibilityCreate),
+)
+async def create_visibility(request: Request):
+    visibility = await parse_body(request, VisibilityCreate)
+    # Input was just validated; model_construct fills server-side defaults
+    # without re-validating the echoed fields.
+    return model_response(VisibilityRead.model_construct(**visibility.model_dump()), status_code=201)
+
+
+@router.put("/visibility/{visibility_id:uuid_str}", response_model=VisibilityRead)
+async def update_visibility(visibility_id: str, update: VisibilityUpdate):
+    raise HTTPException(status_code=501, detail="Not implemented")
+
+
+@router.delete("/visibility/{visibility_id:uuid_str}", status_code=204)
+async def delete_visibility(visibility_id: str):
+    raise HTTPException(status_code=501, detail="Not implemented")
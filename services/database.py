@@ -0,0 +1,150 @@
+from __future__ import annotations
+
+import os
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+# -----------------------------------------------------------
+# 🚀 DB CONNECTION (Cloud SQL with local fallback)
+# -----------------------------------------------------------
+#
+# Engine construction is cheap (no network I/O); connectivity is probed from
+# the FastAPI lifespan so imports stay fast and each forked worker builds its
+# own MySQL pool.
+
+required_env = ["DB_USER", "DB_PASS", "DB_NAME"]
+missing_env = [key for key in required_env if not os.environ.get(key)]
+
+engine = None
+
+# Async twin of the engine for repositories with async methods; only available
+# on the direct-TCP path because the Cloud SQL connector is pymysql-only.
+async_engine = None
+
+if missing_env:
+    print(
+        f"⚠️  Missing DB env vars {missing_env}. "
+        "Skipping database connection; API will start but DB-backed endpoints will fail."
+    )
+else:
+    prefer_local = os.environ.get("USE_LOCAL_DB", "").lower() in ("1", "true", "yes")
+    instance_conn_name = os.environ.get("INSTANCE_CONNECTION_NAME")
+    local_host = os.environ.get("LOCAL_DB_HOST", "127.0.0.1")
+    local_port = int(os.environ.get("LOCAL_DB_PORT", "3306"))
+
+    if prefer_local or not instance_conn_name:
+        # Direct TCP connection to local MySQL (Docker)
+        print(f"Using local MySQL at {local_host}:{local_port}")
+        url = (
+            f"mysql+pymysql://{os.environ['DB_USER']}:{os.environ['DB_PASS']}"
+            f"@{local_host}:{local_port}/{os.environ['DB_NAME']}"
+        )
+        from pymysql.constants import CLIENT
+
+        # MULTI_STATEMENTS lets repositories send dependent writes (e.g. the
+        # primary-photo flip + insert) as one round-trip; all statements still
+        # go through driver-side parameter escaping.
+        connect_args = {"client_flag": CLIENT.MULTI_STATEMENTS}
+        try:
+            # pool_recycle below MySQL's wait_timeout replaces pool_pre_ping:
+            # stale connections are rotated on checkout without spending a
+            # SELECT-1 round-trip on every checkout.
+            engine = create_engine(
+                url,
+                pool_size=10,
+                max_overflow=20,
+                pool_recycle=280,
+                # Batch size for multi-row INSERTs from executemany paths.
+                insertmanyvalues_page_size=1000,
+                # SQL-compilation cache, keyed by statement identity. The
+                # repositories only execute module-level text() constants and
+                # lru_cache'd builders, so after warmup every execute skips
+                # compilation. (Server-side prepared statements would also
+                # skip MySQL's parse/plan, but neither pymysql nor aiomysql
+                # supports them; this is the client-side half.)
+                query_cache_size=500,
+                connect_args=connect_args,
+            )
+            async_engine = create_async_engine(
+                url.replace("mysql+pymysql://", "mysql+aiomysql://"),
+                pool_size=10,
+                max_overflow=20,
+                pool_recycle=280,
+                query_cache_size=500,
+                connect_args=connect_args,
+            )
+        except Exception as exc:
+            print(
+                f"⚠️  Local DB engine setup failed ({exc}). "
+                "Continuing startup without a DB connection; DB-backed endpoints will fail."
+            )
+            engine = None
+            async_engine = None
+    else:
+        # Cloud SQL via connector
+        from google.cloud.sql.connector import Connector  # type: ignore
+        import pymysql  # noqa: F401
+
+        INSTANCE_CONNECTION_NAME = instance_conn_name
+
+        from pymysql.constants import CLIENT
+
+        def getconn():
+            connector = Connector()  # creates secure Cloud SQL tunnel
+            conn = connector.connect(
+                INSTANCE_CONNECTION_NAME,
+                "pymysql",
+                user=os.environ["DB_USER"],
+                password=os.environ["DB_PASS"],
+                db=os.environ["DB_NAME"],
+                # The connector forwards driver kwargs to pymysql; without
+                # this flag the multi-statement primary-photo flip+insert
+                # would be rejected by MySQL on the Cloud SQL path.
+                client_flag=CLIENT.MULTI_STATEMENTS,
+            )
+            return conn
+
+        try:
+            engine = create_engine(
+                "mysql+pymysql://",
+                creator=getconn,
+                pool_recycle=280,
+                query_cache_size=500,
+            )
+            print("Using Cloud SQL Connector.")
+        except Exception as exc:
+            print(
+                f"⚠️  Cloud SQL engine setup failed ({exc}). "
+                "Continuing startup without a DB connection; DB-backed endpoints will fail."
+            )
+            engine = None
+
+
+# Pool-sharing AUTOCOMMIT view for the per-request read connection below.
+async_read_engine = (
+    async_engine.execution_options(isolation_level="AUTOCOMMIT") if async_engine else None
+)
+
+
+def ping_database() -> None:
+    """One-shot connectivity probe; call from the lifespan, not at import."""
+    with engine.connect() as conn:
+        conn.execute(text("SELECT 1"))
+
+
+async def get_connection():
+    """
+    FastAPI dependency yielding one AUTOCOMMIT aiomysql connection for the
+    request.
+
+    Endpoints pass it into repository read methods so several reads in one
+    request share a single pool checkout instead of paying one each. Yields
+    None when there is no async engine (Cloud SQL or in-memory fallback);
+    repositories then use their own engines.
+    """
+    if async_read_engine is None:
+        yield None
+        return
+    async with async_read_engine.connect() as conn:
+        yield conn
@@ -1,24 +1,113 @@
 from __future__ import annotations
 
+from collections import defaultdict
 from datetime import datetime
-from typing import Dict, List, Optional
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
 from uuid import uuid4
 
 from sqlalchemy import text
+from starlette.concurrency import run_in_threadpool
 
-from models.photos import PhotoCreate, PhotoRead, PhotoUpdate
+import msgspec.structs
+
+from models.photos import PhotoCreate, PhotoOut, PhotoUpdate
+from utils.clock import request_now
+
+# Explicit column list in PhotoOut field order, so rows hydrate positionally
+# with no per-row dict; also keeps SELECTs narrow if the table grows columns.
+_PHOTO_COLS = (
+    "photo_id, profile_id, url, is_primary, uploaded_at, created_at, updated_at, description"
+)
+
+# text() builds a new Executable with bind-parameter descriptors on every
+# call; hoisting the statements lets SQLAlchemy reuse the compiled form.
+_SQL_LIST_BY_PROFILE = text(
+    f"SELECT {_PHOTO_COLS} FROM photos WHERE profile_id = :profile_id ORDER BY created_at ASC"
+)
+_SQL_GET = text(f"SELECT {_PHOTO_COLS} FROM photos WHERE photo_id = :photo_id")
+_SQL_INSERT = text(
+    """
+    INSERT INTO photos (
+        photo_id, profile_id, url, is_primary, uploaded_at, description, created_at, updated_at
+    ) VALUES (
+        :photo_id, :profile_id, :url, :is_primary, :uploaded_at, :description, :created_at, :updated_at
+    )
+    """
+)
+_SQL_DELETE = text("DELETE FROM photos WHERE photo_id = :photo_id")
+
+# Driver-level (pyformat) statement sent with MULTI_STATEMENTS enabled so the
+# primary flip and the insert cost a single round-trip.
+_DRIVER_SQL_FLIP_AND_INSERT = (
+    "UPDATE photos SET is_primary = FALSE WHERE profile_id = %(profile_id)s; "
+    "INSERT INTO photos ("
+    "photo_id, profile_id, url, is_primary, uploaded_at, description, created_at, updated_at"
+    ") VALUES ("
+    "%(photo_id)s, %(profile_id)s, %(url)s, %(is_primary)s, %(uploaded_at)s, "
+    "%(description)s, %(created_at)s, %(updated_at)s)"
+)
+
+
+@lru_cache(maxsize=64)
+def _update_statement(fields: Tuple[str, ...]):
+    """Dynamic UPDATE for a given set of changed fields, cached per shape."""
+    set_clauses = [f"{field} = :{field}" for field in fields]
+    set_clauses.append("updated_at = :updated_at")
+    return text(f"UPDATE photos SET {', '.join(set_clauses)} WHERE photo_id = :photo_id")
+
+
+@lru_cache(maxsize=64)
+def _update_with_flip_statement(fields: Tuple[str, ...]):
+    """Single UPDATE over the whole profile that makes the target row primary,
+    clears the others, and applies the changed fields via IF() — one statement
+    instead of flip + update."""
+    set_clauses = ["is_primary = (photo_id = :photo_id)"]
+    set_clauses.extend(
+        f"{field} = IF(photo_id = :photo_id, :{field}, {field})"
+        for field in fields
+        if field != "is_primary"
+    )
+    set_clauses.append("updated_at = IF(photo_id = :photo_id, :updated_at, updated_at)")
+    # ORDER BY demotes the current primary before promoting the target, so the
+    # uq_primary_per_profile unique key is never transiently violated.
+    return text(
+        f"UPDATE photos SET {', '.join(set_clauses)} "
+        "WHERE profile_id = :profile_id ORDER BY (photo_id = :photo_id) ASC"
+    )
 
 
 class PhotoRepository:
-    """Photo persistence with MySQL or in-memory fallback."""
+    """Photo persistence with MySQL or in-memory fallback.
+
+    Public methods are async: they run on the pooled aiomysql engine when one
+    is available (direct-TCP deployments) and fall back to the sync engine via
+    the threadpool otherwise, which also covers the in-memory path.
+    """
 
-    def __init__(self, engine=None):
+    _schema_ready = False
+
+    def __init__(self, engine=None, async_engine=None):
         self.engine = engine
+        self.async_engine = async_engine
+        # Pool-sharing views of the engines with AUTOCOMMIT, so pure reads
+        # skip the implicit BEGIN/COMMIT pair engine.begin() would add.
+        self.read_engine = engine.execution_options(isolation_level="AUTOCOMMIT") if engine else None
+        self.async_read_engine = (
+            async_engine.execution_options(isolation_level="AUTOCOMMIT") if async_engine else None
+        )
         self._memory: Dict[str, Dict] = {}
-        if self.engine:
-            self._ensure_table()
+        # Secondary indexes over _memory so the fallback never scans every
+        # photo: profile -> its photo ids (dict-as-ordered-set, preserving
+        # creation order like the SQL ORDER BY), and profile -> current primary.
+        self._by_profile: Dict[str, Dict[str, None]] = defaultdict(dict)
+        self._primary_by_profile: Dict[str, str] = {}
 
-    def _ensure_table(self) -> None:
+    @classmethod
+    def ensure_schema(cls, engine) -> None:
+        """Run the DDL once at startup rather than on every construction."""
+        if cls._schema_ready or engine is None:
+            return
         ddl = """
         CREATE TABLE IF NOT EXISTS photos (
             photo_id CHAR(36) NOT NULL PRIMARY KEY,
@@ -29,14 +118,69 @@ class PhotoRepository:
             description TEXT,
             created_at DATETIME(6) NOT NULL,
             updated_at DATETIME(6) NOT NULL,
-            INDEX idx_photos_profile_id (profile_id)
+            primary_key_helper CHAR(36) AS (IF(is_primary, profile_id, NULL)) STORED,
+            INDEX idx_photos_profile_created (profile_id, created_at),
+            INDEX idx_photos_profile_primary (profile_id, is_primary),
+            UNIQUE KEY uq_primary_per_profile (primary_key_helper)
         ) CHARACTER SET utf8mb4 COLLATE utf8mb4_unicode_ci;
         """
-        with self.engine.begin() as conn:
+        with engine.begin() as conn:
             conn.execute(text(ddl))
 
-    def _row_to_photo(self, row: Dict) -> PhotoRead:
-        return PhotoRead(
+            # Migrate pre-existing tables from the single-column index: the
+            # composite (profile_id, created_at) serves list_by_profile as an
+            # ordered range scan with no filesort, and (profile_id, is_primary)
+            # narrows the primary-flip UPDATE.
+            def _has_index(name: str) -> int:
+                return conn.execute(
+                    text(
+                        """
+                        SELECT COUNT(*) FROM information_schema.statistics
+                        WHERE TABLE_SCHEMA = DATABASE()
+                          AND TABLE_NAME = 'photos'
+                          AND INDEX_NAME = :name
+                        """
+                    ),
+                    {"name": name},
+                ).scalar()
+
+            if not _has_index("idx_photos_profile_created"):
+                conn.execute(
+                    text("ALTER TABLE photos ADD INDEX idx_photos_profile_created (profile_id, created_at)")
+                )
+            if not _has_index("idx_photos_profile_primary"):
+                conn.execute(
+                    text("ALTER TABLE photos ADD INDEX idx_photos_profile_primary (profile_id, is_primary)")
+                )
+            if _has_index("idx_photos_profile_id"):
+                conn.execute(text("ALTER TABLE photos DROP INDEX idx_photos_profile_id"))
+
+            # Storage-level single-primary invariant: a generated column that
+            # is the profile_id only for primary rows (NULLs don't collide)
+            # under a unique key, so racing writers cannot create two
+            # primaries no matter what the application layer does.
+            has_helper = conn.execute(
+                text(
+                    """
+                    SELECT COUNT(*) FROM information_schema.COLUMNS
+                    WHERE TABLE_SCHEMA = DATABASE()
+                      AND TABLE_NAME = 'photos'
+                      AND COLUMN_NAME = 'primary_key_helper'
+                    """
+                )
+            ).scalar()
+            if not has_helper:
+                conn.execute(
+                    text(
+                        "ALTER TABLE photos "
+                        "ADD COLUMN primary_key_helper CHAR(36) AS (IF(is_primary, profile_id, NULL)) STORED, "
+                        "ADD UNIQUE KEY uq_primary_per_profile (primary_key_helper)"
+                    )
+                )
+        cls._schema_ready = True
+
+    def _row_to_photo(self, row: Dict) -> PhotoOut:
+        return PhotoOut(
             photo_id=row["photo_id"],
             profile_id=row["profile_id"],
             url=row["url"],
@@ -47,88 +191,172 @@ class PhotoRepository:
             updated_at=row["updated_at"],
         )
 
+    @staticmethod
+    def _tuple_to_photo(row) -> PhotoOut:
+        # Positional hydration from a _PHOTO_COLS-ordered row; the bool() is
+        # for MySQL returning TINYINT.
+        return PhotoOut(row[0], row[1], row[2], bool(row[3]), row[4], row[5], row[6], row[7])
+
+    @staticmethod
+    def _new_record(payload: PhotoCreate) -> Dict:
+        now = request_now()
+        return {
+            "photo_id": str(uuid4()),
+            "profile_id": str(payload.profile_id),
+            "url": payload.url,
+            "is_primary": bool(payload.is_primary),
+            "uploaded_at": payload.uploaded_at or now,
+            "description": payload.description,
+            "created_at": now,
+            "updated_at": now,
+        }
+
     # ----------------------------
     # Queries
     # ----------------------------
-    def list_by_profile(self, profile_id: str) -> List[PhotoRead]:
+    async def list_by_profile(self, profile_id: str) -> List[PhotoOut]:
+        if self.async_engine is None:
+            return await run_in_threadpool(self._list_by_profile_sync, profile_id)
+        async with self.async_read_engine.connect() as conn:
+            result = await conn.execute(
+                _SQL_LIST_BY_PROFILE,
+                {"profile_id": profile_id},
+            )
+            return [self._tuple_to_photo(row) for row in result.all()]
+
+    def _list_by_profile_sync(self, profile_id: str) -> List[PhotoOut]:
         if not self.engine:
             return [
-                self._row_to_photo(record)
-                for record in self._memory.values()
-                if record["profile_id"] == profile_id
+                self._row_to_photo(self._memory[pid])
+                for pid in self._by_profile.get(profile_id, ())
             ]
 
-        with self.engine.begin() as conn:
+        with self.read_engine.connect() as conn:
             rows = conn.execute(
-                text("SELECT * FROM photos WHERE profile_id = :profile_id ORDER BY created_at ASC"),
+                _SQL_LIST_BY_PROFILE,
                 {"profile_id": profile_id},
-            ).mappings().all()
-            return [self._row_to_photo(row) for row in rows]
+            ).all()
+            return [self._tuple_to_photo(row) for row in rows]
+
+    async def get(self, photo_id: str) -> Optional[PhotoOut]:
+        if self.async_engine is None:
+            return await run_in_threadpool(self._get_sync, photo_id)
+        async with self.async_read_engine.connect() as conn:
+            result = await conn.execute(
+                _SQL_GET,
+                {"photo_id": photo_id},
+            )
+            row = result.first()
+            return self._tuple_to_photo(row) if row else None
 
-    def get(self, photo_id: str) -> Optional[PhotoRead]:
+    def _get_sync(self, photo_id: str) -> Optional[PhotoOut]:
         if not self.engine:
             record = self._memory.get(photo_id)
             return self._row_to_photo(record) if record else None
 
-        with self.engine.begin() as conn:
+        with self.read_engine.connect() as conn:
             row = conn.execute(
-                text("SELECT * FROM photos WHERE photo_id = :photo_id"),
+                _SQL_GET,
                 {"photo_id": photo_id},
-            ).mappings().first()
-            return self._row_to_photo(row) if row else None
+            ).first()
+            return self._tuple_to_photo(row) if row else None
 
     # ----------------------------
     # Mutations
     # ----------------------------
-    def create(self, payload: PhotoCreate) -> PhotoRead:
-        now = datetime.utcnow()
-        photo_id = str(uuid4())
-        record = {
-            "photo_id": photo_id,
-            "profile_id": str(payload.profile_id),
-            "url": payload.url,
-            "is_primary": bool(payload.is_primary),
-            "uploaded_at": payload.uploaded_at or now,
-            "description": payload.description,
-            "created_at": now,
-            "updated_at": now,
-        }
+    async def create(self, payload: PhotoCreate) -> PhotoOut:
+        record = self._new_record(payload)
+        if self.async_engine is None:
+            return await run_in_threadpool(self._create_sync, record)
+        async with self.async_engine.begin() as conn:
+            if record["is_primary"]:
+                await conn.exec_driver_sql(_DRIVER_SQL_FLIP_AND_INSERT, record)
+            else:
+                await conn.execute(_SQL_INSERT, record)
+        # Every column value is already in record; re-SELECTing the row would
+        # only add a round-trip.
+        return self._row_to_photo(record)
 
+    def _create_sync(self, record: Dict) -> PhotoOut:
         if not self.engine:
-            # enforce single primary per profile in memory
+            profile_id = record["profile_id"]
+            # enforce single primary per profile via the index
             if record["is_primary"]:
-                for r in self._memory.values():
-                    if r["profile_id"] == record["profile_id"]:
-                        r["is_primary"] = False
-            self._memory[photo_id] = record
+                current = self._primary_by_profile.get(profile_id)
+                if current is not None:
+                    self._memory[current]["is_primary"] = False
+                self._primary_by_profile[profile_id] = record["photo_id"]
+            self._memory[record["photo_id"]] = record
+            self._by_profile[profile_id][record["photo_id"]] = None
             return self._row_to_photo(record)
 
         with self.engine.begin() as conn:
             if record["is_primary"]:
-                conn.execute(
-                    text("UPDATE photos SET is_primary = FALSE WHERE profile_id = :pid"),
-                    {"pid": record["profile_id"]},
-                )
-            conn.execute(
-                text(
-                    """
-                    INSERT INTO photos (
-                        photo_id, profile_id, url, is_primary, uploaded_at, description, created_at, updated_at
-                    ) VALUES (
-                        :photo_id, :profile_id, :url, :is_primary, :uploaded_at, :description, :created_at, :updated_at
-                    )
-                    """
-                ),
-                record,
-            )
-            row = conn.execute(
-                text("SELECT * FROM photos WHERE photo_id = :photo_id"),
-                {"photo_id": photo_id},
-            ).mappings().first()
-            return self._row_to_photo(row)
+                conn.exec_driver_sql(_DRIVER_SQL_FLIP_AND_INSERT, record)
+            else:
+                conn.execute(_SQL_INSERT, record)
+        return self._row_to_photo(record)
+
+    async def update(
+        self,
+        photo_id: str,
+        update: PhotoUpdate,
+        existing: Optional[PhotoOut] = None,
+    ) -> Optional[PhotoOut]:
+        """Apply a partial update.
+
+        Callers that already hold the pre-image (the routers fetch it for the
+        ownership check) pass it as ``existing`` so the response can be built
+        locally instead of re-SELECTing the row after the write.
+        """
+        if self.async_engine is None:
+            return await run_in_threadpool(self._update_sync, photo_id, update, existing)
 
-    def update(self, photo_id: str, update: PhotoUpdate) -> Optional[PhotoRead]:
-        now = datetime.utcnow()
+        if existing is None:
+            existing = await self.get(photo_id)
+        if existing is None:
+            return None
+
+        data = update.model_dump(exclude_unset=True)
+        if not data:
+            return existing
+
+        now = request_now()
+        stmt, params = self._build_update(photo_id, existing, data, now)
+        async with self.async_engine.begin() as conn:
+            result = await conn.execute(stmt, params)
+            if result.rowcount == 0:
+                return None
+        return self._merge_photo(existing, data, now)
+
+    @staticmethod
+    def _build_update(photo_id: str, existing: PhotoOut, data: Dict, now: datetime):
+        fields = tuple(sorted(data))
+        if data.get("is_primary"):
+            # single statement promotes this photo and demotes its siblings
+            stmt = _update_with_flip_statement(fields)
+            params = {
+                **data,
+                "photo_id": photo_id,
+                "profile_id": str(existing.profile_id),
+                "updated_at": now,
+            }
+        else:
+            stmt = _update_statement(fields)
+            params = {**data, "photo_id": photo_id, "updated_at": now}
+        return stmt, params
+
+    @staticmethod
+    def _merge_photo(existing: PhotoOut, data: Dict, now: datetime) -> PhotoOut:
+        return msgspec.structs.replace(existing, **data, updated_at=now)
+
+    def _update_sync(
+        self,
+        photo_id: str,
+        update: PhotoUpdate,
+        existing: Optional[PhotoOut] = None,
+    ) -> Optional[PhotoOut]:
+        now = request_now()
         if not self.engine:
             record = self._memory.get(photo_id)
             if not record:
@@ -136,54 +364,60 @@ class PhotoRepository:
             data = update.model_dump(exclude_unset=True)
             if not data:
                 return self._row_to_photo(record)
+            profile_id = record["profile_id"]
             if data.get("is_primary"):
-                # clear other primaries
-                for r in self._memory.values():
-                    if r["profile_id"] == record["profile_id"]:
-                        r["is_primary"] = False
+                # demote the current primary via the index
+                current = self._primary_by_profile.get(profile_id)
+                if current is not None and current != photo_id:
+                    self._memory[current]["is_primary"] = False
+                self._primary_by_profile[profile_id] = photo_id
+            elif data.get("is_primary") is False and self._primary_by_profile.get(profile_id) == photo_id:
+                del self._primary_by_profile[profile_id]
             for field, value in data.items():
                 record[field] = value
             record["updated_at"] = now
             return self._row_to_photo(record)
 
+        if existing is None:
+            existing = self._get_sync(photo_id)
+        if existing is None:
+            return None
+
         data = update.model_dump(exclude_unset=True)
         if not data:
-            return self.get(photo_id)
+            return existing
 
+        stmt, params = self._build_update(photo_id, existing, data, now)
         with self.engine.begin() as conn:
-            if data.get("is_primary"):
-                # unset other primary photos for this profile
-                conn.execute(
-                    text(
-                        "UPDATE photos SET is_primary = FALSE WHERE profile_id = (SELECT profile_id FROM photos WHERE photo_id = :pid)"
-                    ),
-                    {"pid": photo_id},
-                )
-
-            set_clauses = [f"{field} = :{field}" for field in data.keys()]
-            set_clauses.append("updated_at = :updated_at")
-            params = {**data, "photo_id": photo_id, "updated_at": now}
+            result = conn.execute(stmt, params)
+            if result.rowcount == 0:
+                return None
+        return self._merge_photo(existing, data, now)
 
-            conn.execute(
-                text(f"UPDATE photos SET {', '.join(set_clauses)} WHERE photo_id = :photo_id"),
-                params,
-            )
-            row = conn.execute(
-                text("SELECT * FROM photos WHERE photo_id = :photo_id"),
+    async def delete(self, photo_id: str) -> bool:
+        if self.async_engine is None:
+            return await run_in_threadpool(self._delete_sync, photo_id)
+        async with self.async_engine.begin() as conn:
+            result = await conn.execute(
+                _SQL_DELETE,
                 {"photo_id": photo_id},
-            ).mappings().first()
-            return self._row_to_photo(row) if row else None
+            )
+            return result.rowcount > 0
 
-    def delete(self, photo_id: str) -> bool:
+    def _delete_sync(self, photo_id: str) -> bool:
         if not self.engine:
-            if photo_id in self._memory:
-                self._memory.pop(photo_id)
-                return True
-            return False
+            record = self._memory.pop(photo_id, None)
+            if record is None:
+                return False
+            profile_id = record["profile_id"]
+            self._by_profile[profile_id].pop(photo_id, None)
+            if self._primary_by_profile.get(profile_id) == photo_id:
+                del self._primary_by_profile[profile_id]
+            return True
 
         with self.engine.begin() as conn:
             result = conn.execute(
-                text("DELETE FROM photos WHERE photo_id = :photo_id"),
+                _SQL_DELETE,
                 {"photo_id": photo_id},
             )
             return result.rowcount > 0
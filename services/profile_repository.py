@@ -1,24 +1,98 @@
 from __future__ import annotations
 
 from datetime import datetime
-from typing import Dict, Optional
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Tuple
 from uuid import uuid4
 
 from sqlalchemy import text
+from starlette.concurrency import run_in_threadpool
 
-from models.profile import ProfileCreate, ProfileRead, ProfileUpdate
+from models.profile import ProfileCreate, ProfileOut, ProfileUpdate
+from utils.clock import request_now
+
+# Explicit projection in _tuple_to_profile order: a stable plan for the
+# server and positional access on the client, with no RowMapping per row.
+_PROFILE_FIELDS = (
+    "profile_id", "user_id", "first_name", "last_name", "email", "phone",
+    "birth_date", "gender", "location", "bio", "created_at", "updated_at",
+)
+_PROFILE_COLS = ", ".join(_PROFILE_FIELDS)
+
+# Statements are fixed; building the TextClause once at import keeps the
+# construction and compilation-cache lookup off the per-request path.
+_SQL_GET_BY_USER = text(f"SELECT {_PROFILE_COLS} FROM profiles WHERE user_id = :user_id")
+_SQL_GET_BY_ID = text(f"SELECT {_PROFILE_COLS} FROM profiles WHERE profile_id = :profile_id")
+_SQL_GET_OWNED = text(
+    f"SELECT {_PROFILE_COLS} FROM profiles WHERE profile_id = :profile_id AND user_id = :user_id"
+)
+_SQL_INSERT = text(
+    """
+    INSERT INTO profiles (
+        profile_id, user_id, first_name, last_name, email, phone,
+        birth_date, gender, location, bio, created_at, updated_at
+    ) VALUES (
+        :profile_id, :user_id, :first_name, :last_name, :email, :phone,
+        :birth_date, :gender, :location, :bio, :created_at, :updated_at
+    )
+    """
+)
+_SQL_INSERT_IF_ABSENT = text(
+    """
+    INSERT INTO profiles (
+        profile_id, user_id, first_name, last_name, email, phone,
+        birth_date, gender, location, bio, created_at, updated_at
+    )
+    SELECT
+        :profile_id, :user_id, :first_name, :last_name, :email, :phone,
+        :birth_date, :gender, :location, :bio, :created_at, :updated_at
+    FROM DUAL
+    WHERE NOT EXISTS (SELECT 1 FROM profiles WHERE user_id = :user_id)
+    """
+)
+_SQL_DELETE = text(
+    "DELETE FROM profiles WHERE profile_id = :profile_id AND user_id = :user_id"
+)
+
+
+@lru_cache(maxsize=64)
+def _update_statement(fields: Tuple[str, ...]):
+    """Memoized dynamic UPDATE keyed on the sorted tuple of changed fields;
+    payloads reuse the same few field combinations, so this is built rarely."""
+    set_sql = ", ".join([f"{field} = :{field}" for field in fields] + ["updated_at = :updated_at"])
+    return text(
+        f"UPDATE profiles SET {set_sql} WHERE profile_id = :profile_id AND user_id = :user_id"
+    )
 
 
 class ProfileRepository:
-    """Profile persistence with MySQL or in-memory fallback."""
+    """Profile persistence with MySQL or in-memory fallback.
+
+    Public methods are async: they run on the pooled aiomysql engine when one
+    is available (direct-TCP deployments) and fall back to the sync engine via
+    the threadpool otherwise, which also covers the in-memory path.
+    """
 
-    def __init__(self, engine=None):
+    _schema_ready = False
+
+    def __init__(self, engine=None, async_engine=None):
         self.engine = engine
+        self.async_engine = async_engine
+        # Pool-sharing AUTOCOMMIT views: single-row reads skip the
+        # BEGIN/COMMIT pair engine.begin() would add.
+        self.read_engine = engine.execution_options(isolation_level="AUTOCOMMIT") if engine else None
+        self.async_read_engine = (
+            async_engine.execution_options(isolation_level="AUTOCOMMIT") if async_engine else None
+        )
         self._memory: Dict[str, Dict] = {}
-        if self.engine:
-            self._ensure_table()
+        # user_id -> profile_id so fallback lookups don't scan every profile
+        self._user_index: Dict[str, str] = {}
 
-    def _ensure_table(self) -> None:
+    @classmethod
+    def ensure_schema(cls, engine) -> None:
+        """Run the DDL once at startup rather than on every construction."""
+        if cls._schema_ready or engine is None:
+            return
         ddl = """
         CREATE TABLE IF NOT EXISTS profiles (
             profile_id CHAR(36) NOT NULL PRIMARY KEY,
@@ -37,7 +111,7 @@ class ProfileRepository:
             CONSTRAINT uc_profiles_user UNIQUE (user_id)
         ) CHARACTER SET utf8mb4 COLLATE utf8mb4_unicode_ci;
         """
-        with self.engine.begin() as conn:
+        with engine.begin() as conn:
             conn.execute(text(ddl))
 
             # Backfill missing columns/indexes for existing tables on MySQL versions
@@ -80,9 +154,12 @@ class ProfileRepository:
             ).scalar()
             if not has_unique:
                 conn.execute(text("ALTER TABLE profiles ADD CONSTRAINT uc_profiles_user UNIQUE (user_id)"))
+        cls._schema_ready = True
 
-    def _row_to_profile(self, row: Dict) -> ProfileRead:
-        return ProfileRead(
+    def _row_to_profile(self, row: Dict) -> ProfileOut:
+        # Rows come from our own table (or the validated in-memory records);
+        # the Struct fills slots in C with no validation pass.
+        return ProfileOut(
             id=row["profile_id"],
             user_id=row["user_id"],
             first_name=row["first_name"],
@@ -97,37 +174,30 @@ class ProfileRepository:
             updated_at=row["updated_at"],
         )
 
-    def get_by_user_id(self, user_id: str) -> Optional[ProfileRead]:
-        if not self.engine:
-            for record in self._memory.values():
-                if record["user_id"] == user_id:
-                    return self._row_to_profile(record)
-            return None
-
-        with self.engine.begin() as conn:
-            row = conn.execute(
-                text("SELECT * FROM profiles WHERE user_id = :user_id"),
-                {"user_id": user_id},
-            ).mappings().first()
-            return self._row_to_profile(row) if row else None
-
-    def get_by_id(self, profile_id: str) -> Optional[ProfileRead]:
-        if not self.engine:
-            record = self._memory.get(profile_id)
-            return self._row_to_profile(record) if record else None
+    @staticmethod
+    def _tuple_to_profile(row) -> ProfileOut:
+        # Keyword hydration from a _PROFILE_COLS-ordered row (the Struct puts
+        # its optional fields last, so positional order differs).
+        return ProfileOut(
+            id=row[0],
+            user_id=row[1],
+            first_name=row[2],
+            last_name=row[3],
+            email=row[4],
+            phone=row[5],
+            birth_date=row[6],
+            gender=row[7],
+            location=row[8],
+            bio=row[9],
+            created_at=row[10],
+            updated_at=row[11],
+        )
 
-        with self.engine.begin() as conn:
-            row = conn.execute(
-                text("SELECT * FROM profiles WHERE profile_id = :profile_id"),
-                {"profile_id": profile_id},
-            ).mappings().first()
-            return self._row_to_profile(row) if row else None
-
-    def create_profile(self, *, user_id: str, payload: ProfileCreate) -> ProfileRead:
-        now = datetime.utcnow()
-        profile_id = str(uuid4())
-        record = {
-            "profile_id": profile_id,
+    @staticmethod
+    def _new_record(*, user_id: str, payload: ProfileCreate) -> Dict:
+        now = request_now()
+        return {
+            "profile_id": str(uuid4()),
             "user_id": user_id,
             "first_name": payload.first_name,
             "last_name": payload.last_name,
@@ -141,39 +211,178 @@ class ProfileRepository:
             "updated_at": now,
         }
 
+    # ----------------------------
+    # Queries
+    # ----------------------------
+    async def get_by_user_id(self, user_id: str, *, conn=None) -> Optional[ProfileOut]:
+        if self.async_engine is None:
+            return await run_in_threadpool(self._get_by_user_id_sync, user_id)
+        # A caller-supplied per-request connection skips the pool checkout.
+        if conn is not None:
+            row = (await conn.execute(_SQL_GET_BY_USER, {"user_id": user_id})).first()
+        else:
+            async with self.async_read_engine.connect() as c:
+                row = (await c.execute(_SQL_GET_BY_USER, {"user_id": user_id})).first()
+        return self._tuple_to_profile(row) if row else None
+
+    def _get_by_user_id_sync(self, user_id: str) -> Optional[ProfileOut]:
         if not self.engine:
-            self._memory[profile_id] = record
+            profile_id = self._user_index.get(user_id)
+            return self._row_to_profile(self._memory[profile_id]) if profile_id else None
+
+        with self.read_engine.connect() as c:
+            row = c.execute(_SQL_GET_BY_USER, {"user_id": user_id}).first()
+            return self._tuple_to_profile(row) if row else None
+
+    async def get_by_id(self, profile_id: str, *, conn=None) -> Optional[ProfileOut]:
+        if self.async_engine is None:
+            return await run_in_threadpool(self._get_by_id_sync, profile_id)
+        if conn is not None:
+            row = (await conn.execute(_SQL_GET_BY_ID, {"profile_id": profile_id})).first()
+        else:
+            async with self.async_read_engine.connect() as c:
+                row = (await c.execute(_SQL_GET_BY_ID, {"profile_id": profile_id})).first()
+        return self._tuple_to_profile(row) if row else None
+
+    def _get_by_id_sync(self, profile_id: str) -> Optional[ProfileOut]:
+        if not self.engine:
+            record = self._memory.get(profile_id)
+            return self._row_to_profile(record) if record else None
+
+        with self.read_engine.connect() as c:
+            row = c.execute(_SQL_GET_BY_ID, {"profile_id": profile_id}).first()
+            return self._tuple_to_profile(row) if row else None
+
+    # ----------------------------
+    # Mutations
+    # ----------------------------
+    async def create_profile(self, *, user_id: str, payload: ProfileCreate) -> ProfileOut:
+        record = self._new_record(user_id=user_id, payload=payload)
+        if self.async_engine is None:
+            return await run_in_threadpool(self._create_profile_sync, record)
+        async with self.async_engine.begin() as conn:
+            await conn.execute(_SQL_INSERT, record)
+        # Every column value was supplied locally; no re-SELECT needed.
+        return self._row_to_profile(record)
+
+    def _create_profile_sync(self, record: Dict) -> ProfileOut:
+        if not self.engine:
+            self._memory[record["profile_id"]] = record
+            self._user_index[record["user_id"]] = record["profile_id"]
             return self._row_to_profile(record)
 
         with self.engine.begin() as conn:
-            conn.execute(
-                text(
-                    """
-                    INSERT INTO profiles (
-                        profile_id, user_id, first_name, last_name, email, phone,
-                        birth_date, gender, location, bio, created_at, updated_at
-                    ) VALUES (
-                        :profile_id, :user_id, :first_name, :last_name, :email, :phone,
-                        :birth_date, :gender, :location, :bio, :created_at, :updated_at
-                    )
-                    """
-                ),
-                record,
+            conn.execute(_SQL_INSERT, record)
+        return self._row_to_profile(record)
+
+    async def create_profiles_bulk(self, records: Iterable[Dict]) -> List[str]:
+        """
+        Insert many profiles in one executemany round-trip. Each record needs
+        user_id, first_name, last_name and email; the rest of the columns are
+        optional. All-or-nothing under one transaction. Returns profile ids.
+        """
+        now = request_now()
+        rows = []
+        for record in records:
+            rows.append(
+                {
+                    "profile_id": str(uuid4()),
+                    "user_id": record["user_id"],
+                    "first_name": record["first_name"],
+                    "last_name": record["last_name"],
+                    "email": record["email"],
+                    "phone": record.get("phone"),
+                    "birth_date": record.get("birth_date"),
+                    "gender": record.get("gender"),
+                    "location": record.get("location"),
+                    "bio": record.get("bio"),
+                    "created_at": now,
+                    "updated_at": now,
+                }
             )
-            row = conn.execute(
-                text("SELECT * FROM profiles WHERE profile_id = :profile_id"),
-                {"profile_id": profile_id},
-            ).mappings().first()
-            return self._row_to_profile(row)
+        if not rows:
+            return []
+
+        if self.async_engine is None:
+            return await run_in_threadpool(self._create_profiles_bulk_sync, rows)
+        async with self.async_engine.begin() as conn:
+            await conn.execute(_SQL_INSERT, rows)
+        return [row["profile_id"] for row in rows]
 
-    def update_profile(
+    def _create_profiles_bulk_sync(self, rows: List[Dict]) -> List[str]:
+        if not self.engine:
+            for row in rows:
+                self._memory[row["profile_id"]] = row
+                self._user_index[row["user_id"]] = row["profile_id"]
+            return [row["profile_id"] for row in rows]
+
+        with self.engine.begin() as conn:
+            conn.execute(_SQL_INSERT, rows)
+        return [row["profile_id"] for row in rows]
+
+    async def create_profile_if_absent(
+        self, *, user_id: str, payload: ProfileCreate
+    ) -> Optional[ProfileOut]:
+        """
+        Insert the profile only if the user has none, in a single round trip.
+        Returns None when a profile already exists (the caller maps that to a
+        409), which also closes the race window of a get-then-insert pair.
+        """
+        record = self._new_record(user_id=user_id, payload=payload)
+        if self.async_engine is None:
+            return await run_in_threadpool(self._create_profile_if_absent_sync, record)
+        async with self.async_engine.begin() as conn:
+            result = await conn.execute(_SQL_INSERT_IF_ABSENT, record)
+        if not result.rowcount:
+            return None
+        # The inserted values are fully known locally; no re-SELECT needed.
+        return self._row_to_profile(record)
+
+    def _create_profile_if_absent_sync(self, record: Dict) -> Optional[ProfileOut]:
+        if not self.engine:
+            if record["user_id"] in self._user_index:
+                return None
+            self._memory[record["profile_id"]] = record
+            self._user_index[record["user_id"]] = record["profile_id"]
+            return self._row_to_profile(record)
+
+        with self.engine.begin() as conn:
+            result = conn.execute(_SQL_INSERT_IF_ABSENT, record)
+            if not result.rowcount:
+                return None
+            return self._row_to_profile(record)
+
+    async def update_profile(
         self,
         *,
         profile_id: str,
         user_id: str,
         update: ProfileUpdate,
-    ) -> Optional[ProfileRead]:
-        now = datetime.utcnow()
+    ) -> Optional[ProfileOut]:
+        now = request_now()
+        if self.async_engine is None:
+            return await run_in_threadpool(
+                self._update_profile_sync, profile_id, user_id, update, now
+            )
+
+        async with self.async_engine.begin() as conn:
+            owned = (
+                await conn.execute(_SQL_GET_OWNED, {"profile_id": profile_id, "user_id": user_id})
+            ).first()
+            if not owned:
+                return None
+
+            changes = update.model_dump(exclude_unset=True)
+            params = {"profile_id": profile_id, "user_id": user_id, "updated_at": now}
+            params.update(changes)
+            if changes:
+                await conn.execute(_update_statement(tuple(sorted(changes))), params)
+
+        return self._merge_updated(owned, changes, params)
+
+    def _update_profile_sync(
+        self, profile_id: str, user_id: str, update: ProfileUpdate, now: datetime
+    ) -> Optional[ProfileOut]:
         if not self.engine:
             existing = self._memory.get(profile_id)
             if not existing or existing["user_id"] != user_id:
@@ -185,46 +394,47 @@ class ProfileRepository:
 
         with self.engine.begin() as conn:
             owned = conn.execute(
-                text(
-                    "SELECT * FROM profiles WHERE profile_id = :profile_id AND user_id = :user_id"
-                ),
-                {"profile_id": profile_id, "user_id": user_id},
-            ).mappings().first()
+                _SQL_GET_OWNED, {"profile_id": profile_id, "user_id": user_id}
+            ).first()
             if not owned:
                 return None
 
-            set_clauses = []
+            changes = update.model_dump(exclude_unset=True)
             params = {"profile_id": profile_id, "user_id": user_id, "updated_at": now}
-            for field, value in update.model_dump(exclude_unset=True).items():
-                set_clauses.append(f"{field} = :{field}")
-                params[field] = value
-
-            if set_clauses:
-                set_sql = ", ".join(set_clauses + ["updated_at = :updated_at"])
-                conn.execute(
-                    text(
-                        f"UPDATE profiles SET {set_sql} WHERE profile_id = :profile_id AND user_id = :user_id"
-                    ),
-                    params,
-                )
+            params.update(changes)
+            if changes:
+                conn.execute(_update_statement(tuple(sorted(changes))), params)
 
-            row = conn.execute(
-                text("SELECT * FROM profiles WHERE profile_id = :profile_id"),
-                {"profile_id": profile_id},
-            ).mappings().first()
-            return self._row_to_profile(row) if row else None
+        return self._merge_updated(owned, changes, params)
 
-    def delete_profile(self, *, profile_id: str, user_id: str) -> bool:
+    def _merge_updated(self, owned, changes: Dict, params: Dict) -> ProfileOut:
+        # The pre-image was fetched for the ownership check; merge the
+        # changed fields locally instead of re-SELECTing the row.
+        merged = dict(zip(_PROFILE_FIELDS, owned))
+        if changes:
+            for field, value in params.items():
+                if field not in ("profile_id", "user_id"):
+                    merged[field] = value
+        return self._row_to_profile(merged)
+
+    async def delete_profile(self, *, profile_id: str, user_id: str) -> bool:
+        if self.async_engine is None:
+            return await run_in_threadpool(self._delete_profile_sync, profile_id, user_id)
+        async with self.async_engine.begin() as conn:
+            result = await conn.execute(
+                _SQL_DELETE, {"profile_id": profile_id, "user_id": user_id}
+            )
+        return result.rowcount > 0
+
+    def _delete_profile_sync(self, profile_id: str, user_id: str) -> bool:
         if not self.engine:
             existing = self._memory.get(profile_id)
             if not existing or existing["user_id"] != user_id:
                 return False
             self._memory.pop(profile_id)
+            self._user_index.pop(user_id, None)
             return True
 
         with self.engine.begin() as conn:
-            result = conn.execute(
-                text("DELETE FROM profiles WHERE profile_id = :profile_id AND user_id = :user_id"),
-                {"profile_id": profile_id, "user_id": user_id},
-            )
+            result = conn.execute(_SQL_DELETE, {"profile_id": profile_id, "user_id": user_id})
             return result.rowcount > 0
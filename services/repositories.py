@@ -0,0 +1,12 @@
+from __future__ import annotations
+
+from services.database import async_engine, engine
+from services.photo_repository import PhotoRepository
+from services.profile_repository import ProfileRepository
+from services.user_repository import UserRepository
+
+# Single shared instances; repositories are stateless beyond their engine /
+# in-memory fallback dicts, so every router reuses the same objects.
+user_repository = UserRepository(engine, async_engine=async_engine)
+profile_repository = ProfileRepository(engine, async_engine=async_engine)
+photo_repository = PhotoRepository(engine, async_engine=async_engine)
@@ -1,25 +1,120 @@
 from __future__ import annotations
 
+import threading
+import time
 from datetime import datetime
-from typing import Dict, Optional
+from typing import Dict, Iterable, List, Optional, Tuple
 from uuid import uuid4
 
-from passlib.hash import bcrypt
+import bcrypt
 from sqlalchemy import text
+from starlette.concurrency import run_in_threadpool
 
-from models.user import UserPublic
+from models.profile import ProfileOut
+from models.user import UserOut
+from services.profile_repository import _PROFILE_FIELDS, ProfileRepository
+from utils.clock import request_now
+
+
+# Public reads project exactly what _tuple_to_public consumes — positional
+# access with no RowMapping, and wide unused columns (password_hash,
+# google_sub) stay out of the wire format.
+_USER_PUBLIC_COLS = "user_id, email, name, provider, picture, last_login"
+
+# Fixed statements built once at import; methods reference the singletons
+# instead of re-parsing the SQL string per call.
+_SQL_UPSERT_GOOGLE = text(
+    """
+    INSERT INTO users (user_id, email, name, provider, google_sub, picture, created_at, updated_at, last_login)
+    VALUES (:user_id, :email, :name, 'google', :google_sub, :picture, :created_at, :updated_at, :last_login)
+    ON DUPLICATE KEY UPDATE
+        name = VALUES(name),
+        google_sub = VALUES(google_sub),
+        picture = VALUES(picture),
+        provider = 'google',
+        updated_at = VALUES(updated_at),
+        last_login = VALUES(last_login)
+    """
+)
+_SQL_GET_BY_EMAIL = text(f"SELECT {_USER_PUBLIC_COLS} FROM users WHERE email = :email")
+_SQL_EMAIL_EXISTS = text("SELECT user_id FROM users WHERE email = :email")
+_SQL_INSERT_LOCAL = text(
+    """
+    INSERT INTO users (user_id, email, name, provider, password_hash, created_at, updated_at, last_login)
+    VALUES (:user_id, :email, :name, 'local', :password_hash, :created_at, :updated_at, :last_login)
+    """
+)
+_SQL_GET_LOCAL_FOR_LOGIN = text(
+    f"SELECT {_USER_PUBLIC_COLS}, password_hash FROM users WHERE email = :email AND provider = 'local'"
+)
+_SQL_TOUCH_LOGIN = text(
+    "UPDATE users SET last_login = :last_login, updated_at = :updated_at WHERE user_id = :user_id"
+)
+_SQL_GET_BY_ID = text(f"SELECT {_USER_PUBLIC_COLS} FROM users WHERE user_id = :user_id")
+
+# Combined user + profile projection: user columns first (same order as
+# _tuple_to_public), then the profile columns in _PROFILE_FIELDS order, so the
+# row splits cleanly at index 6 for hydration.
+_SQL_GET_USER_WITH_PROFILE = text(
+    "SELECT "
+    + ", ".join(f"u.{col}" for col in _USER_PUBLIC_COLS.split(", "))
+    + ", "
+    + ", ".join(f"p.{col}" for col in _PROFILE_FIELDS)
+    + " FROM users u LEFT JOIN profiles p ON p.user_id = u.user_id"
+    + " WHERE u.user_id = :user_id"
+)
+
+# Users change rarely but get_user_by_id runs on virtually every authenticated
+# request; a short TTL makes hot lookups a dict hit while mutations invalidate
+# the affected entry immediately.
+_USER_CACHE_TTL_SECONDS = 30.0
+_USER_CACHE_MAX_ENTRIES = 10_000
+
+
+def _hash_password(password: str) -> str:
+    return bcrypt.hashpw(password.encode("utf-8"), bcrypt.gensalt()).decode("ascii")
+
+
+def _check_password(password: str, stored) -> bool:
+    """Constant-time bcrypt check against a hash stored as str or bytes."""
+    if isinstance(stored, str):
+        stored = stored.encode("utf-8")
+    return bcrypt.checkpw(password.encode("utf-8"), stored)
 
 
 class UserRepository:
-    """Repository for persisting users with DB-first or in-memory fallback."""
+    """Repository for persisting users with DB-first or in-memory fallback.
 
-    def __init__(self, engine=None):
+    Public methods are async, mirroring ProfileRepository: aiomysql when the
+    async engine exists, otherwise the sync engine (or the in-memory store)
+    via the threadpool. bcrypt work always runs in the threadpool — at ~100ms
+    per hash it would stall the event loop otherwise.
+    """
+
+    _schema_ready = False
+
+    def __init__(self, engine=None, async_engine=None):
         self.engine = engine
+        self.async_engine = async_engine
+        # Pool-sharing AUTOCOMMIT views: single-row reads skip the
+        # BEGIN/COMMIT pair engine.begin() would add.
+        self.read_engine = engine.execution_options(isolation_level="AUTOCOMMIT") if engine else None
+        self.async_read_engine = (
+            async_engine.execution_options(isolation_level="AUTOCOMMIT") if async_engine else None
+        )
         self._memory: Dict[str, Dict] = {}
-        if self.engine:
-            self._ensure_table()
+        # lowercased email -> user_id so fallback lookups don't scan every
+        # user; lowercasing matches the DB path, where the utf8mb4_unicode_ci
+        # collation already compares emails case-insensitively via the index.
+        self._email_index: Dict[str, str] = {}
+        self._user_cache: Dict[str, Tuple[float, UserOut]] = {}
+        self._cache_lock = threading.Lock()
 
-    def _ensure_table(self) -> None:
+    @classmethod
+    def ensure_schema(cls, engine) -> None:
+        """Run the DDL once at startup rather than on every construction."""
+        if cls._schema_ready or engine is None:
+            return
         ddl = """
         CREATE TABLE IF NOT EXISTS users (
             user_id CHAR(36) NOT NULL PRIMARY KEY,
@@ -34,11 +129,12 @@ class UserRepository:
             last_login DATETIME(6)
         ) CHARACTER SET utf8mb4 COLLATE utf8mb4_unicode_ci;
         """
-        with self.engine.begin() as conn:
+        with engine.begin() as conn:
             conn.execute(text(ddl))
+        cls._schema_ready = True
 
-    def _row_to_public(self, row: Dict) -> UserPublic:
-        return UserPublic(
+    def _row_to_public(self, row: Dict) -> UserOut:
+        return UserOut(
             id=row["user_id"],
             email=row["email"],
             name=row.get("name"),
@@ -47,15 +143,79 @@ class UserRepository:
             last_login=row.get("last_login"),
         )
 
-    def upsert_google_user(
+    @staticmethod
+    def _tuple_to_public(row) -> UserOut:
+        # Positional hydration from a _USER_PUBLIC_COLS-ordered row.
+        return UserOut(
+            id=row[0],
+            email=row[1],
+            name=row[2],
+            provider=row[3],
+            picture=row[4],
+            last_login=row[5],
+        )
+
+    # ----------------------------
+    # Mutations
+    # ----------------------------
+    async def upsert_google_user(
         self,
         *,
         email: str,
         name: Optional[str],
         google_sub: str,
         picture: Optional[str],
-    ) -> UserPublic:
-        now = datetime.utcnow()
+    ) -> UserOut:
+        now = request_now()
+        if self.async_engine is None:
+            return await run_in_threadpool(
+                self._upsert_google_user_sync, email, name, google_sub, picture, now
+            )
+
+        user_id = str(uuid4())
+        params = self._google_params(user_id, email, name, google_sub, picture, now)
+        async with self.async_engine.begin() as conn:
+            result = await conn.execute(_SQL_UPSERT_GOOGLE, params)
+            # MySQL reports rowcount 1 for a fresh insert; only the duplicate
+            # path (an existing user, whose user_id we don't know) needs the
+            # follow-up SELECT.
+            if result.rowcount == 1:
+                return self._row_to_public(params)
+            row = (await conn.execute(_SQL_GET_BY_EMAIL, {"email": email})).first()
+        self._invalidate_user(row[0])
+        return self._tuple_to_public(row)
+
+    @staticmethod
+    def _google_params(
+        user_id: str,
+        email: str,
+        name: Optional[str],
+        google_sub: str,
+        picture: Optional[str],
+        now: datetime,
+    ) -> Dict:
+        # provider isn't a bind parameter (the SQL hardcodes 'google') but is
+        # needed when building UserOut from this dict on the insert path.
+        return {
+            "user_id": user_id,
+            "email": email,
+            "name": name,
+            "provider": "google",
+            "google_sub": google_sub,
+            "picture": picture,
+            "created_at": now,
+            "updated_at": now,
+            "last_login": now,
+        }
+
+    def _upsert_google_user_sync(
+        self,
+        email: str,
+        name: Optional[str],
+        google_sub: str,
+        picture: Optional[str],
+        now: datetime,
+    ) -> UserOut:
         if not self.engine:
             existing = self._get_memory_by_email(email)
             if existing:
@@ -69,150 +229,269 @@ class UserRepository:
                         "updated_at": now,
                     }
                 )
+                self._invalidate_user(existing["user_id"])
                 return self._row_to_public(existing)
             user_id = str(uuid4())
-            record = {
-                "user_id": user_id,
-                "email": email,
-                "name": name,
-                "provider": "google",
-                "google_sub": google_sub,
-                "picture": picture,
-                "created_at": now,
-                "updated_at": now,
-                "last_login": now,
-            }
+            record = self._google_params(user_id, email, name, google_sub, picture, now)
             self._memory[user_id] = record
+            self._email_index[email.lower()] = user_id
             return self._row_to_public(record)
 
-        insert_sql = text(
-            """
-            INSERT INTO users (user_id, email, name, provider, google_sub, picture, created_at, updated_at, last_login)
-            VALUES (:user_id, :email, :name, 'google', :google_sub, :picture, :created_at, :updated_at, :last_login)
-            ON DUPLICATE KEY UPDATE
-                name = VALUES(name),
-                google_sub = VALUES(google_sub),
-                picture = VALUES(picture),
-                provider = 'google',
-                updated_at = VALUES(updated_at),
-                last_login = VALUES(last_login)
-            """
-        )
         user_id = str(uuid4())
-        params = {
-            "user_id": user_id,
+        params = self._google_params(user_id, email, name, google_sub, picture, now)
+        with self.engine.begin() as conn:
+            result = conn.execute(_SQL_UPSERT_GOOGLE, params)
+            if result.rowcount == 1:
+                return self._row_to_public(params)
+            row = conn.execute(_SQL_GET_BY_EMAIL, {"email": email}).first()
+            self._invalidate_user(row[0])
+            return self._tuple_to_public(row)
+
+    async def create_local_user(self, *, email: str, password: str, name: Optional[str]) -> UserOut:
+        now = request_now()
+        password_hash = await run_in_threadpool(_hash_password, password)
+        if self.async_engine is None:
+            return await run_in_threadpool(
+                self._create_local_user_sync, email, password_hash, name, now
+            )
+
+        record = self._local_record(email, password_hash, name, now)
+        async with self.async_engine.begin() as conn:
+            existing = (await conn.execute(_SQL_EMAIL_EXISTS, {"email": email})).first()
+            if existing:
+                raise ValueError("User already exists.")
+            await conn.execute(_SQL_INSERT_LOCAL, record)
+        # All column values are known locally; skip the re-SELECT.
+        return self._row_to_public(record)
+
+    @staticmethod
+    def _local_record(email: str, password_hash: str, name: Optional[str], now: datetime) -> Dict:
+        return {
+            "user_id": str(uuid4()),
             "email": email,
             "name": name,
-            "google_sub": google_sub,
-            "picture": picture,
+            "provider": "local",
+            "password_hash": password_hash,
             "created_at": now,
             "updated_at": now,
             "last_login": now,
         }
-        with self.engine.begin() as conn:
-            conn.execute(insert_sql, params)
-            row = conn.execute(
-                text("SELECT * FROM users WHERE email = :email"), {"email": email}
-            ).mappings().first()
-            return self._row_to_public(row)
-
-    def create_local_user(self, *, email: str, password: str, name: Optional[str]) -> UserPublic:
-        now = datetime.utcnow()
-        password_hash = bcrypt.hash(password)
+
+    def _create_local_user_sync(
+        self, email: str, password_hash: str, name: Optional[str], now: datetime
+    ) -> UserOut:
         if not self.engine:
             if self._get_memory_by_email(email):
                 raise ValueError("User already exists.")
-            user_id = str(uuid4())
-            record = {
-                "user_id": user_id,
-                "email": email,
-                "name": name,
-                "provider": "local",
-                "password_hash": password_hash,
-                "created_at": now,
-                "updated_at": now,
-                "last_login": now,
-            }
-            self._memory[user_id] = record
+            record = self._local_record(email, password_hash, name, now)
+            self._memory[record["user_id"]] = record
+            self._email_index[email.lower()] = record["user_id"]
             return self._row_to_public(record)
 
         with self.engine.begin() as conn:
-            existing = conn.execute(
-                text("SELECT user_id FROM users WHERE email = :email"), {"email": email}
-            ).first()
+            existing = conn.execute(_SQL_EMAIL_EXISTS, {"email": email}).first()
             if existing:
                 raise ValueError("User already exists.")
+            record = self._local_record(email, password_hash, name, now)
+            conn.execute(_SQL_INSERT_LOCAL, record)
+            return self._row_to_public(record)
 
-            user_id = str(uuid4())
-            conn.execute(
-                text(
-                    """
-                    INSERT INTO users (user_id, email, name, provider, password_hash, created_at, updated_at, last_login)
-                    VALUES (:user_id, :email, :name, 'local', :password_hash, :created_at, :updated_at, :last_login)
-                    """
-                ),
+    async def create_users_bulk(self, records: Iterable[Dict]) -> List[str]:
+        """
+        Insert many local users in one executemany round-trip (pymysql
+        rewrites INSERT ... VALUES into a single multi-row statement). Each
+        record needs an email; name and password are optional. All-or-nothing:
+        a duplicate email fails the whole batch. Returns the new user ids.
+        """
+        # The hashing loop is CPU-bound (bcrypt), so build the rows off-loop.
+        rows = await run_in_threadpool(self._build_bulk_rows, list(records))
+        if not rows:
+            return []
+
+        if self.async_engine is None:
+            return await run_in_threadpool(self._create_users_bulk_sync, rows)
+        async with self.async_engine.begin() as conn:
+            await conn.execute(_SQL_INSERT_LOCAL, rows)
+        return [row["user_id"] for row in rows]
+
+    @staticmethod
+    def _build_bulk_rows(records: List[Dict]) -> List[Dict]:
+        now = request_now()
+        rows = []
+        for record in records:
+            password = record.get("password")
+            rows.append(
                 {
-                    "user_id": user_id,
-                    "email": email,
-                    "name": name,
-                    "password_hash": password_hash,
+                    "user_id": str(uuid4()),
+                    "email": record["email"],
+                    "name": record.get("name"),
+                    "provider": "local",
+                    "password_hash": _hash_password(password) if password else None,
                     "created_at": now,
                     "updated_at": now,
-                    "last_login": now,
-                },
+                    "last_login": None,
+                }
             )
-            row = conn.execute(
-                text("SELECT * FROM users WHERE user_id = :user_id"), {"user_id": user_id}
-            ).mappings().first()
-            return self._row_to_public(row)
+        return rows
 
-    def verify_local_credentials(self, *, email: str, password: str) -> Optional[UserPublic]:
-        now = datetime.utcnow()
+    def _create_users_bulk_sync(self, rows: List[Dict]) -> List[str]:
+        if not self.engine:
+            for row in rows:
+                if row["email"].lower() in self._email_index:
+                    raise ValueError("User already exists.")
+            for row in rows:
+                self._memory[row["user_id"]] = row
+                self._email_index[row["email"].lower()] = row["user_id"]
+            return [row["user_id"] for row in rows]
+
+        with self.engine.begin() as conn:
+            conn.execute(_SQL_INSERT_LOCAL, rows)
+        return [row["user_id"] for row in rows]
+
+    async def verify_local_credentials(self, *, email: str, password: str) -> Optional[UserOut]:
+        now = request_now()
+        if self.async_engine is None:
+            return await run_in_threadpool(self._verify_local_credentials_sync, email, password, now)
+
+        async with self.async_engine.begin() as conn:
+            row = (await conn.execute(_SQL_GET_LOCAL_FOR_LOGIN, {"email": email})).first()
+            if not (row and row[6]):
+                return None
+            if not await run_in_threadpool(_check_password, password, row[6]):
+                return None
+            await conn.execute(
+                _SQL_TOUCH_LOGIN,
+                {"last_login": now, "updated_at": now, "user_id": row[0]},
+            )
+        # The row was just read; only last_login changed.
+        self._invalidate_user(row[0])
+        return UserOut(
+            id=row[0],
+            email=row[1],
+            name=row[2],
+            provider=row[3],
+            picture=row[4],
+            last_login=now,
+        )
+
+    def _verify_local_credentials_sync(
+        self, email: str, password: str, now: datetime
+    ) -> Optional[UserOut]:
         if not self.engine:
             record = self._get_memory_by_email(email)
-            if record and record.get("password_hash") and bcrypt.verify(password, record["password_hash"]):
+            if record and record.get("password_hash") and _check_password(password, record["password_hash"]):
                 record.update({"last_login": now, "updated_at": now})
+                self._invalidate_user(record["user_id"])
                 return self._row_to_public(record)
             return None
 
         with self.engine.begin() as conn:
-            row = conn.execute(
-                text(
-                    "SELECT * FROM users WHERE email = :email AND provider = 'local'"
-                ),
-                {"email": email},
-            ).mappings().first()
-            if row and row.get("password_hash") and bcrypt.verify(password, row["password_hash"]):
+            row = conn.execute(_SQL_GET_LOCAL_FOR_LOGIN, {"email": email}).first()
+            if row and row[6] and _check_password(password, row[6]):
                 conn.execute(
-                    text(
-                        "UPDATE users SET last_login = :last_login, updated_at = :updated_at WHERE user_id = :user_id"
-                    ),
-                    {
-                        "last_login": now,
-                        "updated_at": now,
-                        "user_id": row["user_id"],
-                    },
+                    _SQL_TOUCH_LOGIN,
+                    {"last_login": now, "updated_at": now, "user_id": row[0]},
+                )
+                self._invalidate_user(row[0])
+                return UserOut(
+                    id=row[0],
+                    email=row[1],
+                    name=row[2],
+                    provider=row[3],
+                    picture=row[4],
+                    last_login=now,
                 )
-                refreshed = conn.execute(
-                    text("SELECT * FROM users WHERE user_id = :user_id"),
-                    {"user_id": row["user_id"]},
-                ).mappings().first()
-                return self._row_to_public(refreshed)
             return None
 
-    def get_user_by_id(self, user_id: str) -> Optional[UserPublic]:
+    # ----------------------------
+    # Queries
+    # ----------------------------
+    async def get_user_by_id(self, user_id: str, *, conn=None) -> Optional[UserOut]:
+        entry = self._user_cache.get(user_id)
+        now = time.monotonic()
+        if entry and entry[0] > now:
+            return entry[1]
+
+        if self.async_engine is None:
+            user = await run_in_threadpool(self._get_user_by_id_sync, user_id)
+        elif conn is not None:
+            # A caller-supplied per-request connection skips the pool checkout.
+            row = (await conn.execute(_SQL_GET_BY_ID, {"user_id": user_id})).first()
+            user = self._tuple_to_public(row) if row else None
+        else:
+            async with self.async_read_engine.connect() as c:
+                row = (await c.execute(_SQL_GET_BY_ID, {"user_id": user_id})).first()
+                user = self._tuple_to_public(row) if row else None
+
+        if user:
+            with self._cache_lock:
+                if len(self._user_cache) >= _USER_CACHE_MAX_ENTRIES:
+                    self._user_cache.clear()
+                self._user_cache[user_id] = (now + _USER_CACHE_TTL_SECONDS, user)
+        return user
+
+    def _get_user_by_id_sync(self, user_id: str) -> Optional[UserOut]:
         if not self.engine:
             record = self._memory.get(user_id)
             return self._row_to_public(record) if record else None
 
-        with self.engine.begin() as conn:
-            row = conn.execute(
-                text("SELECT * FROM users WHERE user_id = :user_id"), {"user_id": user_id}
-            ).mappings().first()
-            return self._row_to_public(row) if row else None
+        with self.read_engine.connect() as c:
+            row = c.execute(_SQL_GET_BY_ID, {"user_id": user_id}).first()
+            return self._tuple_to_public(row) if row else None
+
+    def _invalidate_user(self, user_id: str) -> None:
+        with self._cache_lock:
+            self._user_cache.pop(user_id, None)
+
+    async def get_user_with_profile(
+        self,
+        user_id: str,
+        *,
+        conn=None,
+        profile_repository: Optional[ProfileRepository] = None,
+    ) -> Optional[Tuple[UserOut, Optional[ProfileOut]]]:
+        """
+        Fetch the user and their profile in one LEFT JOIN instead of two
+        SELECTs on two repositories. The fallback composes from the given
+        profile_repository since the in-memory stores are per-repository.
+        """
+        if self.async_engine is None:
+            return await run_in_threadpool(
+                self._get_user_with_profile_sync, user_id, profile_repository
+            )
+
+        if conn is not None:
+            row = (await conn.execute(_SQL_GET_USER_WITH_PROFILE, {"user_id": user_id})).first()
+        else:
+            async with self.async_read_engine.connect() as c:
+                row = (await c.execute(_SQL_GET_USER_WITH_PROFILE, {"user_id": user_id})).first()
+        return self._split_user_profile_row(row)
+
+    def _get_user_with_profile_sync(
+        self, user_id: str, profile_repository: Optional[ProfileRepository]
+    ) -> Optional[Tuple[UserOut, Optional[ProfileOut]]]:
+        if not self.engine:
+            record = self._memory.get(user_id)
+            if not record:
+                return None
+            profile = (
+                profile_repository._get_by_user_id_sync(user_id) if profile_repository else None
+            )
+            return self._row_to_public(record), profile
+
+        with self.read_engine.connect() as c:
+            row = c.execute(_SQL_GET_USER_WITH_PROFILE, {"user_id": user_id}).first()
+        return self._split_user_profile_row(row)
+
+    def _split_user_profile_row(
+        self, row
+    ) -> Optional[Tuple[UserOut, Optional[ProfileOut]]]:
+        if not row:
+            return None
+        # LEFT JOIN: profile columns are all NULL when the user has no profile.
+        profile = ProfileRepository._tuple_to_profile(row[6:]) if row[6] is not None else None
+        return self._tuple_to_public(row), profile
 
     def _get_memory_by_email(self, email: str) -> Optional[Dict]:
-        for record in self._memory.values():
-            if record["email"] == email:
-                return record
-        return None
+        user_id = self._email_index.get(email.lower())
+        return self._memory.get(user_id) if user_id else None
@@ -0,0 +1,25 @@
+from __future__ import annotations
+
+from contextvars import ContextVar
+from datetime import datetime, timezone
+
+# Timestamp taken once at request start by RequestClockMiddleware. The write
+# paths read 4-6 timestamps on a single auth/create flow; sharing one value
+# skips the repeated clock call + datetime construction and makes every
+# created_at/updated_at within a request identical, which is what callers
+# comparing the two fields expect anyway.
+REQUEST_NOW: ContextVar[datetime | None] = ContextVar("REQUEST_NOW", default=None)
+
+
+def utcnow() -> datetime:
+    """Naive UTC now — the tz-aware replacement for deprecated utcnow().
+
+    Kept naive because the DATETIME columns and orjson's OPT_NAIVE_UTC
+    serialization both assume naive-UTC values.
+    """
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+def request_now() -> datetime:
+    """The current request's timestamp, or a fresh one outside a request."""
+    return REQUEST_NOW.get() or utcnow()